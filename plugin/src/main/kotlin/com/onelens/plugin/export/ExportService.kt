@@ -5,8 +5,9 @@ import com.intellij.openapi.diagnostic.logger
 import com.intellij.openapi.project.Project
 import com.onelens.plugin.OneLensConstants
 import com.onelens.plugin.export.collectors.*
-import kotlinx.serialization.encodeToString
+import kotlinx.serialization.ExperimentalSerializationApi
 import kotlinx.serialization.json.Json
+import kotlinx.serialization.json.encodeToStream
 import java.nio.file.Files
 import java.nio.file.Path
 import java.time.Instant
@@ -21,7 +22,10 @@ class ExportService {
         private val LOG = logger<ExportService>()
 
         private val json = Json {
-            prettyPrint = true
+            // Compact output: exports are machine-read (onelens import), and
+            // on a large export the indentation is a sizable share of the
+            // bytes, paid on encode, on disk and again on the Python parse.
+            prettyPrint = false
             encodeDefaults = true
         }
     }
@@ -30,6 +34,7 @@ class ExportService {
      * Run a full export of the project's code intelligence.
      * Executes all collectors and writes a complete JSON file.
      */
+    @OptIn(ExperimentalSerializationApi::class)
     fun exportFull(
         project: Project,
         config: ExportConfig,
@@ -131,7 +136,9 @@ class ExportService {
         Files.createDirectories(outputDir)
         val fileName = "${project.name}-full-${System.currentTimeMillis()}.json"
         val outputFile = outputDir.resolve(fileName)
-        Files.writeString(outputFile, json.encodeToString(document))
+        // Stream straight to disk: a full export is hundreds of MB of JSON,
+        // which encodeToString would first materialize as one String.
+        Files.newOutputStream(outputFile).buffered().use { json.encodeToStream(document, it) }
 
         // Update state
         val state = ExportState.getInstance(project)
@@ -9,8 +9,9 @@ import com.onelens.plugin.OneLensConstants
 import com.onelens.plugin.export.*
 import com.onelens.plugin.export.collectors.*
 import kotlinx.serialization.Serializable
-import kotlinx.serialization.encodeToString
+import kotlinx.serialization.ExperimentalSerializationApi
 import kotlinx.serialization.json.Json
+import kotlinx.serialization.json.encodeToStream
 import java.nio.file.Files
 import java.nio.file.Path
 
@@ -30,7 +31,8 @@ object DeltaExportService {
     private val LOG = logger<DeltaExportService>()
 
     private val json = Json {
-        prettyPrint = true
+        // Compact, like the full export: only `onelens import` reads it.
+        prettyPrint = false
         encodeDefaults = true
     }
 
@@ -108,6 +110,7 @@ object DeltaExportService {
      * Export delta for a specific list of changed files.
      * Called by exportDelta() and by AutoSyncService.
      */
+    @OptIn(ExperimentalSerializationApi::class)
     fun exportDeltaForFiles(
         project: Project,
         config: ExportConfig,
@@ -205,7 +208,9 @@ object DeltaExportService {
         Files.createDirectories(outputDir)
         val fileName = "${project.name}-delta-${System.currentTimeMillis()}.json"
         val outputFile = outputDir.resolve(fileName)
-        Files.writeString(outputFile, json.encodeToString(delta))
+        // Stream straight to disk, as the full export does, instead of
+        // materializing the whole document as one String first.
+        Files.newOutputStream(outputFile).buffered().use { json.encodeToStream(delta, it) }
 
         // 7. Update state
         val newHash = DeltaTracker.getCurrentGitHash(basePath)
@@ -3,8 +3,8 @@
 import logging
 import os
 import sqlite3
-
-import chromadb
+import threading
+import time
 
 from .base import BaseCollection
 
@@ -43,6 +43,18 @@ def _fix_blob_seq_ids(palace_path: str):
         logger.exception("Could not fix BLOB seq_ids in %s", db_path)
 
 
+# count() is polled by status / L0 wake-up on every call, and each one is an
+# FFI hop into Chroma's SQLite. Cache per collection id for a few seconds;
+# writes through the adapter invalidate immediately, so the TTL only bounds
+# staleness from writers in *other* processes (e.g. a CLI import while the
+# daemon is serving).
+COUNT_CACHE_TTL_S = 5.0
+_count_cache: dict[str, tuple[float, int]] = {}
+
+# Fallback when the client doesn't report its own limit.
+DEFAULT_MAX_BATCH_SIZE = 5000
+
+
 class ChromaCollection(BaseCollection):
     """Thin adapter over a ChromaDB collection with external embedder.
 
@@ -51,31 +63,59 @@ class ChromaCollection(BaseCollection):
     max_seq_length, and use bf16.
     """
 
-    def __init__(self, collection, embedder=None):
+    def __init__(self, collection, embedder=None, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
         self._collection = collection
         self._embedder = embedder
+        self._max_batch = max(1, max_batch_size)
+
+    def embed(self, documents):
+        """Encode to one contiguous (N, dim) float32 array.
 
-    def _embed(self, documents):
+        Handed to Chroma as-is (chromadb>=1.0 accepts ndarrays for
+        `embeddings` / `query_embeddings`). The old `.tolist()` exploded every
+        500-doc batch into 500 x 1024 boxed Python floats only for Chroma to
+        pack them straight back into float32 buffers.
+        """
         if self._embedder is None:
             raise RuntimeError("ChromaCollection has no embedder attached")
-        return self._embedder.encode(documents).tolist()
+        return self._embedder.encode(documents)
+
+    def _invalidate_count(self):
+        _count_cache.pop(str(self._collection.id), None)
+
+    def _write(self, write, documents, ids, metadatas, embeddings=None):
+        """Embed once, then hand Chroma slices no larger than its max batch.
+
+        Chroma rejects a write over the client's max batch size outright, so
+        a large delta (or a caller-chosen batch above the limit) would fail
+        as a whole instead of landing in pieces.
+        """
+        if embeddings is None:
+            embeddings = self.embed(documents)
+        step = self._max_batch
+        for i in range(0, len(ids), step):
+            write(
+                documents=documents[i : i + step],
+                ids=ids[i : i + step],
+                metadatas=metadatas[i : i + step] if metadatas is not None else None,
+                embeddings=embeddings[i : i + step],
+            )
+        self._invalidate_count()
 
-    def add(self, *, documents, ids, metadatas=None):
-        embeddings = self._embed(documents)
-        self._collection.add(
-            documents=documents, ids=ids, metadatas=metadatas, embeddings=embeddings
-        )
+    def add(self, *, documents, ids, metadatas=None, embeddings=None):
+        self._write(self._collection.add, documents, ids, metadatas, embeddings)
 
-    def upsert(self, *, documents, ids, metadatas=None):
-        embeddings = self._embed(documents)
-        self._collection.upsert(
-            documents=documents, ids=ids, metadatas=metadatas, embeddings=embeddings
-        )
+    def upsert(self, *, documents, ids, metadatas=None, embeddings=None):
+        """Pass `embeddings` to skip encoding (caller already embedded)."""
+        self._write(self._collection.upsert, documents, ids, metadatas, embeddings)
 
     def query(self, *, query_texts=None, **kwargs):
-        # Embed query text with the same model so query/doc vectors live in same space
+        # Embed query text with the same model so query/doc vectors live in same
+        # space. Repeat queries are served from the embedder's LRU.
         if query_texts is not None and "query_embeddings" not in kwargs:
-            kwargs["query_embeddings"] = self._embed(query_texts)
+            if self._embedder is None:
+                raise RuntimeError("ChromaCollection has no embedder attached")
+            kwargs["query_embeddings"] = self._embedder.encode_queries(query_texts)
             return self._collection.query(**kwargs)
         return self._collection.query(query_texts=query_texts, **kwargs)
 
@@ -83,10 +123,24 @@ class ChromaCollection(BaseCollection):
         return self._collection.get(**kwargs)
 
     def delete(self, **kwargs):
-        self._collection.delete(**kwargs)
+        ids = kwargs.pop("ids", None)
+        if ids is None or len(ids) <= self._max_batch:
+            self._collection.delete(ids=ids, **kwargs)
+        else:
+            step = self._max_batch
+            for i in range(0, len(ids), step):
+                self._collection.delete(ids=ids[i : i + step], **kwargs)
+        self._invalidate_count()
 
     def count(self):
-        return self._collection.count()
+        key = str(self._collection.id)
+        now = time.monotonic()
+        cached = _count_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        n = self._collection.count()
+        _count_cache[key] = (now + COUNT_CACHE_TTL_S, n)
+        return n
 
 
 class ChromaBackend:
@@ -102,11 +156,20 @@ class ChromaBackend:
         self._client = None
         self._client_path = None
         self._embedder = None
+        # One client per palace path and one adapter per collection, reused
+        # across calls. Every retrieve used to re-run the BLOB seq_id scan
+        # over chroma.sqlite3 and re-resolve the collection; the daemon
+        # serving several graphs also rebuilt its client on every switch.
+        self._clients: dict[str, object] = {}
+        self._collections: dict[tuple[str, str], ChromaCollection] = {}
+        self._lock = threading.Lock()
 
     def _get_embedder(self):
+        # The process-wide instance: the daemon warms it at startup, and a
+        # second copy here would double VRAM and leave queries cold.
         if self._embedder is None:
-            from onelens.context.embedder import QwenEmbedder
-            self._embedder = QwenEmbedder()
+            from onelens.context.embedder import get_default_embedder
+            self._embedder = get_default_embedder()
         return self._embedder
 
     def get_collection(self, palace_path: str, collection_name: str, create: bool = False):
@@ -120,18 +183,38 @@ class ChromaBackend:
             except (OSError, NotImplementedError):
                 pass
 
-        _fix_blob_seq_ids(palace_path)
-        if self._client is None or self._client_path != palace_path:
-            self._client = chromadb.PersistentClient(path=palace_path)
+        key = (palace_path, collection_name)
+        cached = self._collections.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            cached = self._collections.get(key)
+            if cached is not None:
+                return cached
+
+            client = self._clients.get(palace_path)
+            if client is None:
+                # Imported on first open: chromadb is the optional `context`
+                # extra and costs ~1s to import, which graph-only commands
+                # never need. The BLOB fix must precede client creation.
+                import chromadb
+
+                _fix_blob_seq_ids(palace_path)
+                client = self._clients[palace_path] = chromadb.PersistentClient(path=palace_path)
+            self._client = client
             self._client_path = palace_path
 
-        if create:
-            collection = self._client.get_or_create_collection(
-                collection_name, metadata={"hnsw:space": "cosine"}
+            if create:
+                collection = client.get_or_create_collection(
+                    collection_name, metadata={"hnsw:space": "cosine"}
+                )
+            else:
+                collection = client.get_collection(collection_name)
+            adapter = self._collections[key] = ChromaCollection(
+                collection, embedder=self._get_embedder(), max_batch_size=self.max_batch_size
             )
-        else:
-            collection = self._client.get_collection(collection_name)
-        return ChromaCollection(collection, embedder=self._get_embedder())
+            return adapter
 
     @property
     def embedding_device(self) -> str:
@@ -147,4 +230,4 @@ class ChromaBackend:
                 fn = getattr(self._client, attr, None)
                 if fn is not None:
                     return fn() if callable(fn) else fn
-        return 5000
+        return DEFAULT_MAX_BATCH_SIZE
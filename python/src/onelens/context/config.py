@@ -7,6 +7,7 @@ Priority: env vars > config file (~/.onelens/context_config.json) > defaults
 import json
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -22,6 +23,30 @@ HALL_RUNTIME = "hall_runtime"
 HALL_DECISIONS = "hall_decisions"
 HALL_DOCS = "hall_docs"
 
+# How many callers may run a forward pass on one shared model (embedder or
+# reranker) at once. The HTTP daemon serves tool calls from a thread pool;
+# unbounded, a burst of `retrieve` calls all hit the same GPU model together,
+# contend for VRAM (OOM-halving kicks in) and every call gets slower. 1 =
+# strictly serialized, which is optimal on a single small GPU.
+DEFAULT_MODEL_CONCURRENCY = 1
+
+
+def _env_int(name: str, default: int | None, minimum: int = 1) -> int | None:
+    """Integer env override, clamped to `minimum`; `default` if unset or not an int."""
+    override = os.environ.get(name)
+    if override:
+        try:
+            return max(minimum, int(override))
+        except ValueError:
+            pass
+    return default
+
+
+def model_concurrency() -> int:
+    """Max concurrent forward passes per model. Override: ONELENS_MODEL_CONCURRENCY."""
+    return _env_int("ONELENS_MODEL_CONCURRENCY", DEFAULT_MODEL_CONCURRENCY)
+
+
 # ── Input validation (from MemPalace) ────────────────────────────────────────
 
 MAX_NAME_LENGTH = 128
@@ -89,3 +114,25 @@ class OneLensContextConfig:
         except (OSError, NotImplementedError):
             pass
         return path
+
+
+def get_default_config() -> OneLensContextConfig:
+    """Process-wide config for the default ~/.onelens directory.
+
+    Shared so layer and tool calls don't each read and JSON-parse
+    context_config.json. Keyed on the file's mtime, so an edit still takes
+    effect on the next call without restarting the daemon; the cost of a
+    hit is one stat. Env overrides (ONELENS_CONTEXT_PATH) are still read
+    per call.
+    """
+    config_file = Path(os.path.expanduser("~/.onelens")) / "context_config.json"
+    try:
+        mtime_ns = config_file.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _default_config_at(mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _default_config_at(mtime_ns: int | None) -> OneLensContextConfig:
+    return OneLensContextConfig()
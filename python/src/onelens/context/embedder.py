@@ -17,10 +17,22 @@ Design decisions (2026-04):
 
 import logging
 import os
+import threading
 import time
+from collections import OrderedDict
+
+from .config import _env_int, model_concurrency
 
 logger = logging.getLogger(__name__)
 
+# Accepted ONELENS_EMBED_DTYPE values -> torch dtype name. The name is passed
+# to getattr(torch, ...), so anything outside this table is rejected.
+_DTYPE_ALIASES = {
+    "float32": "float32", "fp32": "float32",
+    "float16": "float16", "fp16": "float16", "half": "float16",
+    "bfloat16": "bfloat16", "bf16": "bfloat16",
+}
+
 # Prevent VRAM fragmentation from dynamic-shape torch.compile on small GPUs.
 # Must be set BEFORE torch is imported for the first time.
 os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
@@ -41,12 +53,9 @@ def _auto_batch_size() -> int:
     Override with ONELENS_EMBED_BATCH — Modal images set this so remote runs
     don't inherit the local 4GB tuning.
     """
-    override = os.environ.get("ONELENS_EMBED_BATCH")
-    if override:
-        try:
-            return max(1, int(override))
-        except ValueError:
-            pass
+    override = _env_int("ONELENS_EMBED_BATCH", None)
+    if override is not None:
+        return override
     try:
         import torch
         if not torch.cuda.is_available():
@@ -65,6 +74,29 @@ def _auto_batch_size() -> int:
 
 DEFAULT_BATCH = _auto_batch_size()
 
+# Query embeddings kept per embedder. The daemon sees the same handful of
+# queries over and over (retrieve retries, Layer-3 search after retrieve,
+# agents re-asking with the same phrasing). Each miss is a full forward pass
+# queued behind the model semaphore. A row is 1024 float32s (4KB), so the
+# default costs ~4MB. Override with ONELENS_QUERY_CACHE (0 disables).
+DEFAULT_QUERY_CACHE = 1024
+
+
+# Output dimension. Qwen3-Embedding is Matryoshka-trained, so a prefix of
+# the 1024-dim vector is itself a usable embedding: 512 dims halve the
+# palace's vector storage and every HNSW distance evaluation for a small
+# recall cost. None keeps the full width. Every drawer in a palace must share
+# one width, so changing ONELENS_EMBED_DIM requires a full --context re-mine.
+DEFAULT_EMBED_DIM = None
+
+
+def _embed_dim() -> int | None:
+    return _env_int("ONELENS_EMBED_DIM", DEFAULT_EMBED_DIM)
+
+
+def _query_cache_size() -> int:
+    return _env_int("ONELENS_QUERY_CACHE", DEFAULT_QUERY_CACHE, minimum=0)
+
 
 class QwenEmbedder:
     """Wraps SentenceTransformer with optimizations for Qwen3 on small GPUs."""
@@ -77,6 +109,7 @@ class QwenEmbedder:
         batch_size: int = DEFAULT_BATCH,
         use_compile: bool = False,           # off by default: varied shapes → recompile thrash
         attn_impl: str = None,               # "flash_attention_2" | "sdpa" | "eager"; auto if None
+        truncate_dim: int = None,            # Matryoshka prefix width; ONELENS_EMBED_DIM if None
     ):
         import torch
         from sentence_transformers import SentenceTransformer
@@ -85,6 +118,12 @@ class QwenEmbedder:
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         self.batch_size = batch_size
         self._calls = 0
+        # One instance is shared by every request in the daemon; cap how many
+        # threads drive it at once (see config.model_concurrency).
+        self._slots = threading.BoundedSemaphore(model_concurrency())
+        self._query_cache: OrderedDict[str, object] = OrderedDict()
+        self._query_cache_max = _query_cache_size()
+        self._query_lock = threading.Lock()
 
         # Flash Attention 2 — Qwen3 README explicitly recommends it; gives ~2-3×
         # throughput on Ampere+ by fusing the attention kernel and dropping the
@@ -93,15 +132,29 @@ class QwenEmbedder:
         resolved_attn = attn_impl or self._pick_attn_impl()
         model_kwargs = {"attn_implementation": resolved_attn} if resolved_attn else {}
 
+        # sentence-transformers truncates before normalize_embeddings, so the
+        # shortened vectors are still unit length.
+        truncate_dim = truncate_dim or _embed_dim()
+
         logger.info("Loading %s on %s (attn=%s)...", model_name, self.device, resolved_attn or "sdpa")
         t0 = time.time()
         self._model = SentenceTransformer(
-            model_name, device=self.device, model_kwargs=model_kwargs
+            model_name, device=self.device, model_kwargs=model_kwargs,
+            truncate_dim=truncate_dim,
         )
         self._model.max_seq_length = max_seq_length
         self._model_name = model_name
         self._attn_impl = resolved_attn or "sdpa"
 
+        # Half-precision weights/activations on GPU: encoding is memory-
+        # bandwidth bound at our batch sizes, so 2-byte dtypes roughly halve
+        # the bytes moved per forward pass (and free VRAM for the reranker).
+        # `encode` casts its output back to float32, so stored embeddings
+        # are unchanged in layout; cosine rankings match fp32 to within noise.
+        self.dtype = self._pick_dtype(self.device)
+        if self.dtype != "float32":
+            self._model.to(getattr(torch, self.dtype))
+
         # torch.compile is OFF by default. Reason: our inputs have highly varied
         # token counts (bodies 0-512 tokens, classes <100), which either triggers
         # constant recompiles (reduce-overhead mode) or adds per-call overhead
@@ -117,7 +170,35 @@ class QwenEmbedder:
             except Exception as e:
                 logger.warning("torch.compile failed, falling back: %s", e)
 
-        logger.info("Model ready in %.1fs", time.time() - t0)
+        logger.info("Model ready in %.1fs (dtype=%s)", time.time() - t0, self.dtype)
+
+    @staticmethod
+    def _pick_dtype(device: str) -> str:
+        """bfloat16 on Ampere+ GPUs, float32 on older GPUs and on CPU.
+
+        bf16 was faster than fp16 on Ampere in our measurements and has no
+        overflow risk. Pre-Ampere cards (T4, V100) lack bf16 units, and fp16's
+        narrow range lets Qwen-family activations overflow to inf/NaN, so
+        they stay in fp32; ONELENS_EMBED_DTYPE=fp16 opts in anyway. CPU
+        matmuls in half precision are slower than fp32 on most hosts.
+        """
+        override = os.environ.get("ONELENS_EMBED_DTYPE")
+        if override and override.lower() != "auto":
+            dtype = _DTYPE_ALIASES.get(override.lower())
+            if dtype is not None:
+                return dtype
+            logger.warning(
+                "Ignoring ONELENS_EMBED_DTYPE=%r (expected one of %s); using auto",
+                override, ", ".join(sorted(_DTYPE_ALIASES)),
+            )
+        if device != "cuda":
+            return "float32"
+        try:
+            import torch
+            major, _ = torch.cuda.get_device_capability(0)
+        except Exception:
+            return "float32"
+        return "bfloat16" if major >= 8 else "float32"
 
     @staticmethod
     def _pick_attn_impl() -> str | None:
@@ -147,22 +228,76 @@ class QwenEmbedder:
         return "flash_attention_2"
 
     def encode(self, texts: list[str], batch_size: int = None, show_progress: bool = False):
-        """Encode a list of texts. Returns numpy array (N, dim)."""
+        """Encode a list of texts. Returns float32 numpy array (N, dim).
+
+        Identical texts in one call are encoded once and fanned back out;
+        generated code (mappers, DTO accessors, CRUD endpoints) yields
+        byte-identical drawer bodies more often than one would expect.
+        """
+        unique = dict.fromkeys(texts)
+        if len(unique) < len(texts):
+            keys = list(unique)
+            pos = {t: i for i, t in enumerate(keys)}
+            return self.encode(keys, batch_size, show_progress)[[pos[t] for t in texts]]
+
+        import numpy as np
+
         bs = batch_size or self.batch_size
-        out = self._model.encode(
-            texts,
-            batch_size=bs,
-            normalize_embeddings=True,
-            show_progress_bar=show_progress,
-            convert_to_numpy=True,
-        )
+        with self._slots:
+            out = self._model.encode(
+                texts,
+                batch_size=bs,
+                normalize_embeddings=True,
+                show_progress_bar=show_progress,
+                convert_to_numpy=True,
+            )
         self._calls += 1
         # Periodically release reserved-but-unallocated blocks to fight
         # fragmentation from dynamic-shape compilation.
         if self.device == "cuda" and self._calls % 10 == 0:
             import torch
             torch.cuda.empty_cache()
-        return out
+        # Half-precision models hand back fp16 arrays (only bf16 is upcast).
+        return out.astype(np.float32, copy=False)
+
+    def encode_queries(self, texts: list[str]):
+        """Encode query texts through a process-local LRU. Returns (N, dim).
+
+        Only misses go through the model, as one batch. Keyed on the exact
+        text: queries are short, so hashing them would cost more than the
+        dict lookup it replaces.
+        """
+        import numpy as np
+
+        if self._query_cache_max == 0:
+            return self.encode(texts)
+        cache = self._query_cache
+        with self._query_lock:
+            rows = [cache.get(t) for t in texts]
+            for t, row in zip(texts, rows):
+                if row is not None:
+                    cache.move_to_end(t)
+        misses = list(dict.fromkeys(t for t, row in zip(texts, rows) if row is None))
+        if not misses:
+            # np.stack copies, so callers can't mutate cached rows.
+            return np.stack(rows)
+
+        encoded = self.encode(misses)
+        # Cached rows are views into this batch. Freezing it keeps callers
+        # from mutating them, without copying each row into the cache.
+        encoded.flags.writeable = False
+        fresh = dict(zip(misses, encoded))
+        with self._query_lock:
+            for t, row in fresh.items():
+                cache[t] = row
+                cache.move_to_end(t)
+            while len(cache) > self._query_cache_max:
+                cache.popitem(last=False)
+        if len(misses) == len(texts):
+            # Every text was new and distinct (the usual single-query case):
+            # the encoded batch is already the answer, in order.
+            return encoded
+        return np.stack([fresh[t] if row is None else row for t, row in zip(texts, rows)])
 
     @property
     def dim(self) -> int:
@@ -171,3 +306,18 @@ class QwenEmbedder:
     @property
     def model_name(self) -> str:
         return self._model_name
+
+
+# Module-level singleton so the daemon's warmed model is the one queries use.
+_DEFAULT_EMBEDDER: QwenEmbedder = None
+_DEFAULT_EMBEDDER_LOCK = threading.Lock()
+
+
+def get_default_embedder() -> QwenEmbedder:
+    """Return a lazily-initialized shared QwenEmbedder instance."""
+    global _DEFAULT_EMBEDDER
+    if _DEFAULT_EMBEDDER is None:
+        with _DEFAULT_EMBEDDER_LOCK:
+            if _DEFAULT_EMBEDDER is None:
+                _DEFAULT_EMBEDDER = QwenEmbedder()
+    return _DEFAULT_EMBEDDER
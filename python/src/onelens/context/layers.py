@@ -17,9 +17,9 @@ Adapted from MemPalace's layers.py for engineering context.
 from collections import defaultdict
 from pathlib import Path
 
-from .config import OneLensContextConfig, DEFAULT_COLLECTION_NAME
+from .config import OneLensContextConfig, DEFAULT_COLLECTION_NAME, get_default_config
 from .palace import get_collection as _get_collection
-from .searcher import build_where_filter
+from .searcher import build_where_filter, similarities
 
 
 # ---------------------------------------------------------------------------
@@ -27,6 +27,17 @@ from .searcher import build_where_filter
 # ---------------------------------------------------------------------------
 
 
+# Labels summarized in the L0 wake-up line, in display order.
+_L0_COUNT_LABELS = ("Class", "Method", "Endpoint", "SpringBean")
+
+_KEY_SERVICES = """
+    MATCH (caller:Method)-[:CALLS]->(callee:Method)<-[:HAS_METHOD]-(c:Class)
+    WHERE NOT callee.external = true
+    RETURN c.name as name, count(DISTINCT caller) as fanIn
+    ORDER BY fanIn DESC LIMIT 5
+"""
+
+
 class Layer0:
     """
     ~100 tokens. Always loaded.
@@ -53,7 +64,7 @@ class Layer0:
 
         # Fallback: ChromaDB metadata
         try:
-            config = OneLensContextConfig()
+            config = get_default_config()
             col = _get_collection(config.context_path(self.graph_name), create=False)
             count = col.count()
             parts.append(f"Context drawers: {count}")
@@ -79,27 +90,15 @@ class Layer0:
 
     def _get_falkordb_stats(self) -> str:
         """Query FalkorDB for graph stats."""
-        lines = []
-        # Node counts
-        for label in ["Class", "Method", "Endpoint", "SpringBean"]:
-            try:
-                result = self.db.query(f"MATCH (n:{label}) RETURN count(n) as cnt")
-                if result:
-                    lines.append(f"{label}: {result[0]['cnt']}")
-            except Exception:
-                continue
-
-        if not lines:
+        # Node counts, one round-trip for all four labels
+        counts = self.db.node_counts(_L0_COUNT_LABELS)
+        if not counts:
             return ""
+        lines = [f"{label}: {cnt}" for label, cnt in counts.items()]
 
         # Top services by fan-in
         try:
-            result = self.db.query("""
-                MATCH (caller:Method)-[:CALLS]->(callee:Method)<-[:HAS_METHOD]-(c:Class)
-                WHERE NOT callee.external = true
-                RETURN c.name as name, count(DISTINCT caller) as fanIn
-                ORDER BY fanIn DESC LIMIT 5
-            """)
+            result = self.db.query(_KEY_SERVICES)
             if result:
                 top = ", ".join(f"{r['name']} ({r['fanIn']} callers)" for r in result)
                 lines.append(f"Key services: {top}")
@@ -129,37 +128,38 @@ class Layer1:
 
     def generate(self) -> str:
         """Pull top drawers from ChromaDB and format as compact L1 text."""
-        config = OneLensContextConfig()
+        config = get_default_config()
         try:
             col = _get_collection(config.context_path(self.graph_name), create=False)
         except Exception:
             return "## L1 — No context found. Run: onelens import <json> --graph <name> --context"
 
-        # Fetch drawers in batches
-        docs, metas = [], []
+        # Scan metadata only — importance lives there. Documents are pulled
+        # afterwards for the handful of winners instead of for all MAX_SCAN.
+        ids, metas = [], []
         offset = 0
         while True:
-            kwargs = {"include": ["documents", "metadatas"], "limit": 500, "offset": offset}
+            kwargs = {"include": ["metadatas"], "limit": 500, "offset": offset}
             try:
                 batch = col.get(**kwargs)
             except Exception:
                 break
-            batch_docs = batch.get("documents", [])
+            batch_ids = batch.get("ids", [])
             batch_metas = batch.get("metadatas", [])
-            if not batch_docs:
+            if not batch_ids:
                 break
-            docs.extend(batch_docs)
+            ids.extend(batch_ids)
             metas.extend(batch_metas)
-            offset += len(batch_docs)
-            if len(docs) >= self.MAX_SCAN:
+            offset += len(batch_ids)
+            if len(ids) >= self.MAX_SCAN:
                 break
 
-        if not docs:
+        if not ids:
             return "## L1 — No context drawers yet."
 
         # Score by importance metadata
         scored = []
-        for doc, meta in zip(docs, metas):
+        for drawer_id, meta in zip(ids, metas):
             importance = 0.0
             for key in ("importance", "weight"):
                 val = meta.get(key)
@@ -169,10 +169,16 @@ class Layer1:
                     except (ValueError, TypeError):
                         pass
                     break
-            scored.append((importance, meta, doc))
+            scored.append((importance, meta, drawer_id))
 
         scored.sort(key=lambda x: x[0], reverse=True)
-        top = scored[: self.MAX_DRAWERS]
+        winners = scored[: self.MAX_DRAWERS]
+        try:
+            fetched = col.get(ids=[drawer_id for _, _, drawer_id in winners], include=["documents"])
+            doc_by_id = dict(zip(fetched.get("ids", []), fetched.get("documents", [])))
+        except Exception:
+            doc_by_id = {}
+        top = [(imp, meta, doc_by_id.get(drawer_id) or "") for imp, meta, drawer_id in winners]
 
         # Group by room (package)
         by_room = defaultdict(list)
@@ -223,7 +229,7 @@ class Layer2:
 
     def retrieve(self, room: str = None, entity_type: str = None, n_results: int = 10) -> str:
         """Retrieve drawers filtered by package (room) and/or entity type."""
-        config = OneLensContextConfig()
+        config = get_default_config()
         try:
             col = _get_collection(config.context_path(self.graph_name), create=False)
         except Exception:
@@ -272,7 +278,7 @@ class Layer3:
 
     def search(self, query: str, room: str = None, entity_type: str = None, n_results: int = 5) -> str:
         """Semantic search, returns formatted text."""
-        config = OneLensContextConfig()
+        config = get_default_config()
         try:
             col = _get_collection(config.context_path(self.graph_name), create=False)
         except Exception:
@@ -301,8 +307,7 @@ class Layer3:
             return f'No results found for: "{query}"'
 
         lines = [f'## L3 — SEARCH RESULTS for "{query}"']
-        for i, (doc, meta, dist) in enumerate(zip(docs, metas, dists), 1):
-            similarity = round(max(0.0, 1 - dist), 3)
+        for i, (doc, meta, similarity) in enumerate(zip(docs, metas, similarities(dists)), 1):
             entity_type_str = meta.get("type", "?")
             fqn = meta.get("fqn", "")
             room_name = meta.get("room", "?")
@@ -320,7 +325,7 @@ class Layer3:
 
     def search_raw(self, query: str, room: str = None, entity_type: str = None, n_results: int = 5) -> list:
         """Return raw dicts for programmatic use."""
-        config = OneLensContextConfig()
+        config = get_default_config()
         try:
             col = _get_collection(config.context_path(self.graph_name), create=False)
         except Exception:
@@ -342,10 +347,10 @@ class Layer3:
             return []
 
         hits = []
-        for doc, meta, dist in zip(
+        for doc, meta, similarity in zip(
             results["documents"][0],
             results["metadatas"][0],
-            results["distances"][0],
+            similarities(results["distances"][0]),
         ):
             hits.append({
                 "text": doc,
@@ -354,7 +359,7 @@ class Layer3:
                 "wing": meta.get("wing", ""),
                 "room": meta.get("room", ""),
                 "importance": meta.get("importance", 0.0),
-                "similarity": round(max(0.0, 1 - dist), 3),
+                "similarity": similarity,
             })
         return hits
 
@@ -376,7 +381,7 @@ class ContextStack:
 
     def __init__(self, graph_name: str, db=None, config: OneLensContextConfig = None):
         self.graph_name = graph_name
-        self.config = config or OneLensContextConfig()
+        self.config = config or get_default_config()
 
         self.l0 = Layer0(graph_name, db=db)
         self.l1 = Layer1(graph_name)
@@ -4,10 +4,17 @@ palace.py — Shared context collection operations.
 Provides the ChromaDB collection factory for the context graph.
 """
 
-from .backends.chroma import ChromaBackend
+from functools import lru_cache
+
 from .config import DEFAULT_COLLECTION_NAME
 
-_DEFAULT_BACKEND = ChromaBackend()
+
+@lru_cache(maxsize=1)
+def _default_backend():
+    """Process-wide backend, built on first use rather than at import."""
+    from .backends.chroma import ChromaBackend
+
+    return ChromaBackend()
 
 
 def get_collection(
@@ -16,7 +23,7 @@ def get_collection(
     create: bool = True,
 ):
     """Get the ChromaDB collection for a graph's context."""
-    return _DEFAULT_BACKEND.get_collection(
+    return _default_backend().get_collection(
         context_path,
         collection_name=collection_name,
         create=create,
@@ -25,9 +32,9 @@ def get_collection(
 
 def get_max_batch_size() -> int:
     """Max batch size supported by the current ChromaDB client."""
-    return _DEFAULT_BACKEND.max_batch_size
+    return _default_backend().max_batch_size
 
 
 def get_embedding_device() -> str:
     """Device used for embedding: 'cuda', 'cpu', or 'cpu-onnx'."""
-    return _DEFAULT_BACKEND.embedding_device
+    return _default_backend().embedding_device
@@ -27,7 +27,7 @@ logger = logging.getLogger("mempalace_mcp")
 MAX_QUERY_LENGTH = 250  # Above this, prompt contamination increasingly dominates
 SAFE_QUERY_LENGTH = 200  # Below this, query is almost certainly clean
 MIN_QUERY_LENGTH = 10  # Extracted result shorter than this = extraction failed
-QUOTE_CHARS = {"'", '"'}
+QUOTE_CHARS = frozenset({"'", '"'})
 
 # Sentence splitter: split on . ! ? (including fullwidth) and newlines
 _SENTENCE_SPLIT = re.compile(r"[.!?。！？\n]+")
@@ -36,6 +36,40 @@ _SENTENCE_SPLIT = re.compile(r"[.!?。！？\n]+")
 _QUESTION_MARK = re.compile(r'[?？]\s*["\']?\s*$')
 
 
+# Candidate clean-up helpers. Module-level so sanitize_query doesn't rebuild
+# two closures on every call; neither captures any per-call state.
+def _strip_wrapping_quotes(candidate: str) -> str:
+    candidate = candidate.strip()
+    while (
+        len(candidate) >= 2 and candidate[:1] in QUOTE_CHARS and candidate[:1] == candidate[-1:]
+    ):
+        candidate = candidate[1:-1].strip()
+        if not candidate:
+            return ""
+    if candidate[:1] in QUOTE_CHARS:
+        candidate = candidate[1:].strip()
+    if candidate[-1:] in QUOTE_CHARS:
+        candidate = candidate[:-1].strip()
+    return candidate
+
+
+def _trim_candidate(candidate: str) -> str:
+    candidate = _strip_wrapping_quotes(candidate)
+    if len(candidate) <= MAX_QUERY_LENGTH:
+        return candidate
+
+    nested_fragments = [
+        _strip_wrapping_quotes(frag)
+        for frag in _SENTENCE_SPLIT.split(candidate)
+        if frag.strip()
+    ]
+    for frag in reversed(nested_fragments):
+        if MIN_QUERY_LENGTH <= len(frag) <= MAX_QUERY_LENGTH:
+            return frag
+
+    return candidate[-MAX_QUERY_LENGTH:].strip()
+
+
 def sanitize_query(raw_query: str) -> dict:
     """
     Extract the actual search intent from a potentially contaminated query.
@@ -68,36 +102,6 @@ def sanitize_query(raw_query: str) -> dict:
     raw_query = raw_query.strip()
     original_length = len(raw_query)
 
-    def _strip_wrapping_quotes(candidate: str) -> str:
-        candidate = candidate.strip()
-        while (
-            len(candidate) >= 2 and candidate[:1] in QUOTE_CHARS and candidate[:1] == candidate[-1:]
-        ):
-            candidate = candidate[1:-1].strip()
-            if not candidate:
-                return ""
-        if candidate[:1] in QUOTE_CHARS:
-            candidate = candidate[1:].strip()
-        if candidate[-1:] in QUOTE_CHARS:
-            candidate = candidate[:-1].strip()
-        return candidate
-
-    def _trim_candidate(candidate: str) -> str:
-        candidate = _strip_wrapping_quotes(candidate)
-        if len(candidate) <= MAX_QUERY_LENGTH:
-            return candidate
-
-        nested_fragments = [
-            _strip_wrapping_quotes(frag)
-            for frag in _SENTENCE_SPLIT.split(candidate)
-            if frag.strip()
-        ]
-        for frag in reversed(nested_fragments):
-            if MIN_QUERY_LENGTH <= len(frag) <= MAX_QUERY_LENGTH:
-                return frag
-
-        return candidate[-MAX_QUERY_LENGTH:].strip()
-
     # --- Step 1: Short query passthrough ---
     if original_length <= SAFE_QUERY_LENGTH:
         return {
@@ -109,31 +113,29 @@ def sanitize_query(raw_query: str) -> dict:
         }
 
     # --- Step 2: Question extraction ---
-    # Split into sentences and find ones ending with ?
-    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(raw_query) if s.strip()]
-
-    # Also split on newlines to catch questions on their own line
-    all_segments = []
-    for s in raw_query.split("\n"):
-        s = s.strip()
-        if s:
-            all_segments.append(s)
-
-    # Look for question marks in segments (prefer later ones = more likely the actual query)
-    question_sentences = []
-    for seg in reversed(all_segments):
-        if _QUESTION_MARK.search(seg):
-            question_sentences.append(seg)
+    # Split on newlines to catch questions on their own line
+    all_segments = [seg for seg in map(str.strip, raw_query.split("\n")) if seg]
 
-    if not question_sentences:
-        # Also check the sentence-split results
-        for sent in reversed(sentences):
-            if "?" in sent or "？" in sent:
-                question_sentences.append(sent)
+    # Look for question marks in segments (prefer later ones = more likely the
+    # actual query). Only the last question is used, so stop at the first hit.
+    question = next(
+        (seg for seg in reversed(all_segments) if _QUESTION_MARK.search(seg)), None
+    )
+
+    if question is None:
+        # Also check sentence-split results. Only split when the newline
+        # pass found nothing: most contaminated queries end in a question on
+        # its own line, and this split is a second full pass over the input.
+        sentences = [
+            sent for sent in map(str.strip, _SENTENCE_SPLIT.split(raw_query)) if sent
+        ]
+        question = next(
+            (sent for sent in reversed(sentences) if "?" in sent or "？" in sent), None
+        )
 
-    if question_sentences:
+    if question is not None:
         # Take the last (most recent) question found
-        candidate = question_sentences[0].strip()
+        candidate = question.strip()
         if len(candidate) >= MIN_QUERY_LENGTH:
             # Apply length guard
             if len(candidate) > MAX_QUERY_LENGTH:
@@ -15,8 +15,13 @@ Design (2026 benchmarks, see docs for sources):
 """
 
 import logging
+import threading
 import time
 
+import numpy as np
+
+from .config import model_concurrency
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_MODEL = "mixedbread-ai/mxbai-rerank-base-v1"
@@ -43,20 +48,28 @@ class Reranker:
         self.max_length = max_length
         self.batch_size = batch_size
         self._model = None
+        # Shared across concurrent daemon requests; bound in-flight predicts
+        # so a burst of queries queues instead of fighting over VRAM.
+        self._slots = threading.BoundedSemaphore(model_concurrency())
+        self._load_lock = threading.Lock()
 
     def _ensure_loaded(self):
         if self._model is not None:
             return
-        import torch
-        from sentence_transformers import CrossEncoder
+        # Concurrent first requests must not each load their own copy.
+        with self._load_lock:
+            if self._model is not None:
+                return
+            import torch
+            from sentence_transformers import CrossEncoder
 
-        if self.device is None:
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            if self.device is None:
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
 
-        logger.info("Loading reranker %s on %s...", self.model_name, self.device)
-        t0 = time.time()
-        self._model = CrossEncoder(self.model_name, device=self.device, max_length=self.max_length)
-        logger.info("Reranker ready in %.1fs", time.time() - t0)
+            logger.info("Loading reranker %s on %s...", self.model_name, self.device)
+            t0 = time.time()
+            self._model = CrossEncoder(self.model_name, device=self.device, max_length=self.max_length)
+            logger.info("Reranker ready in %.1fs", time.time() - t0)
 
     def score(self, query: str, documents: list[str]) -> list[float]:
         """Score (query, document) pairs. Returns one score per doc.
@@ -64,16 +77,21 @@ class Reranker:
         OOM-safe: halves batch size and retries on CUDA OOM; final fallback
         returns zeros (rerank disabled) rather than crashing.
         """
+        return self._score_array(query, documents).tolist()
+
+    def _score_array(self, query: str, documents: list[str]) -> np.ndarray:
+        """`score` as a float64 vector, for callers that rank on it directly."""
         if not documents:
-            return []
+            return np.zeros(0)
         self._ensure_loaded()
 
         pairs = [(query, d) for d in documents]
         bs = self.batch_size
         while bs >= 1:
             try:
-                scores = self._model.predict(pairs, batch_size=bs, show_progress_bar=False)
-                return [float(s) for s in scores]
+                with self._slots:
+                    scores = self._model.predict(pairs, batch_size=bs, show_progress_bar=False)
+                return np.asarray(scores, dtype=np.float64)
             except RuntimeError as e:
                 msg = str(e).lower()
                 if "out of memory" in msg or "cuda" in msg and "memory" in msg:
@@ -82,7 +100,7 @@ class Reranker:
                         torch.cuda.empty_cache()
                     if bs <= 1:
                         logger.warning("Reranker OOM even at batch=1, skipping rerank")
-                        return [0.0] * len(documents)
+                        return np.zeros(len(documents))
                     bs = max(1, bs // 2)
                     logger.warning("Reranker OOM, retrying with batch=%d", bs)
                     continue
@@ -94,6 +112,7 @@ class Reranker:
         hits: list,
         doc_fn=None,
         top_k: int = None,
+        min_score: float = None,
     ) -> list:
         """Reorder a list of hits by cross-encoder score.
 
@@ -103,27 +122,42 @@ class Reranker:
             doc_fn: callable extracting document text from each hit
                     (default: hit.snippet or hit.context_text for RetrievalHit)
             top_k: truncate to top_k after reranking (default: keep all)
+            min_score: drop hits whose (rounded) score is below this, before
+                       any score is attached or the result list is built
         """
         if not hits:
             return hits
 
+        # A hit list is homogeneous (all RetrievalHit or all dicts), so decide
+        # the shape once here instead of isinstance/hasattr per hit below.
+        as_dict = isinstance(hits[0], dict)
         if doc_fn is None:
-            doc_fn = _default_doc_fn
+            doc_fn = _dict_doc_fn if as_dict else _default_doc_fn
 
         docs = [doc_fn(h) or "" for h in hits]
-        scores = self.score(query, docs)
-        if not scores or all(s == 0.0 for s in scores):
+        scores = self._score_array(query, docs)
+        if not scores.any():
             return hits[:top_k] if top_k else hits
 
-        ranked = sorted(zip(hits, scores), key=lambda x: -x[1])
-        # Attach the rerank score onto each hit when possible
-        for h, s in ranked:
-            if hasattr(h, "rerank_score"):
-                h.rerank_score = round(s, 4)
-            elif isinstance(h, dict):
-                h["rerank_score"] = round(s, 4)
-        out = [h for h, _ in ranked]
-        return out[:top_k] if top_k else out
+        # Rank on the score vector instead of sorting (hit, score) tuples in
+        # Python. Stable, so equal scores keep their fused (RRF) order exactly
+        # as the old sorted() did; at pool sizes of ~100 a full argsort is
+        # cheaper than argpartition + re-sort and keeps ties deterministic.
+        order = np.argsort(-scores, kind="stable")[: top_k or None]
+        rounded_arr = np.round(scores, 4)
+        if min_score is not None:
+            # Scores are descending along `order`, so the cut is a prefix.
+            order = order[rounded_arr[order] >= min_score]
+        order = order.tolist()
+        rounded = rounded_arr.tolist()
+        # Attach the rerank score onto each kept hit when possible
+        if as_dict:
+            for i in order:
+                hits[i]["rerank_score"] = rounded[i]
+        elif hasattr(hits[0], "rerank_score"):
+            for i in order:
+                hits[i].rerank_score = rounded[i]
+        return [hits[i] for i in order]
 
 
 def _default_doc_fn(hit) -> str:
@@ -132,9 +166,12 @@ def _default_doc_fn(hit) -> str:
     Prefers the actual code snippet (richer signal); falls back to the
     embedding doc text (FQN + metadata) when snippet unavailable.
     """
-    snippet = getattr(hit, "snippet", "") or (hit.get("snippet", "") if isinstance(hit, dict) else "")
-    context = getattr(hit, "context_text", "") or (hit.get("context", "") if isinstance(hit, dict) else "")
-    return snippet or context or ""
+    return getattr(hit, "snippet", "") or getattr(hit, "context_text", "") or ""
+
+
+def _dict_doc_fn(hit: dict) -> str:
+    """`_default_doc_fn` for plain-dict hits (`search_context` output shape)."""
+    return hit.get("snippet", "") or hit.get("context", "") or ""
 
 
 # Module-level singleton so the model stays loaded across queries in a session.
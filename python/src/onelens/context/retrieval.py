@@ -16,10 +16,11 @@ Typical latency on a warm cache: ~150-250ms for 10 hits with snippets.
 import concurrent.futures
 import logging
 import os
+from itertools import islice
 from dataclasses import dataclass, field
 from typing import Optional
 
-from .config import DEFAULT_COLLECTION_NAME
+from .config import DEFAULT_COLLECTION_NAME, _env_int
 from .searcher import search_context
 
 logger = logging.getLogger(__name__)
@@ -28,6 +29,9 @@ logger = logging.getLogger(__name__)
 RRF_K = 60
 DEFAULT_FANOUT = 50
 MAX_SNIPPET_LINES = 80
+# Concurrent source-file reads when attaching snippets (up to rerank_pool
+# files per query). Override via env ONELENS_SNIPPET_WORKERS.
+DEFAULT_SNIPPET_WORKERS = 8
 
 # PageRank boost: after fusion, multiply each hit's score by
 # (1 + PAGERANK_WEIGHT * normalized_pr). PR is graph-topological — it
@@ -56,9 +60,14 @@ _BOOST_ENDPOINT = 2.5
 _BOOST_FQN_MATCH = 2.0
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrievalHit:
-    """A single retrieval result with score, location, and optional snippet."""
+    """A single retrieval result with score, location, and optional snippet.
+
+    Slotted: one is built per candidate in every retrieval stage (~150 per
+    query before rerank), so skipping the per-instance `__dict__` keeps
+    construction and attribute access cheap on the warm-daemon hot path.
+    """
 
     fqn: str
     type: str
@@ -75,14 +84,22 @@ class RetrievalHit:
     callees: list = field(default_factory=list)
 
 
-_HTTP_VERBS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+_HTTP_VERBS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+
+# Shared, immutable type-hint sets. `_detect_query_kind` runs on every query
+# and used to build a fresh set literal per branch; consumers only test
+# membership, so one frozen instance per shape is enough.
+_NO_TYPES: frozenset[str] = frozenset()
+_ENDPOINT_TYPES = frozenset({"endpoint"})
+_METHOD_TYPES = frozenset({"method"})
+_CLASS_TYPES = frozenset({"class"})
 
 
 def _detect_query_kind(query: str) -> dict:
     """Parse query shape → hint for which node types to boost.
 
     Returns a dict with keys:
-        preferred_types: set of node types to boost (e.g., {"class"})
+        preferred_types: frozenset of node types to boost (e.g., {"class"})
         boost_factor: multiplier for hits of preferred types
         fqn_substring: if query looks like a qualified name fragment
                        (contains '.' or '#'), boost hits whose fqn contains it
@@ -90,7 +107,7 @@ def _detect_query_kind(query: str) -> dict:
     """
     q = query.strip()
     out = {
-        "preferred_types": set(),
+        "preferred_types": _NO_TYPES,
         "boost_factor": 1.0,
         "fqn_substring": "",
         "is_route": False,
@@ -99,7 +116,7 @@ def _detect_query_kind(query: str) -> dict:
     # Route-shaped query: starts with '/', or HTTP_VERB + space + /path
     first_token = q.split(None, 1)[0] if q else ""
     if q.startswith("/") or first_token.upper() in _HTTP_VERBS:
-        out["preferred_types"] = {"endpoint"}
+        out["preferred_types"] = _ENDPOINT_TYPES
         out["boost_factor"] = _BOOST_ENDPOINT
         out["is_route"] = True
         return out
@@ -107,7 +124,7 @@ def _detect_query_kind(query: str) -> dict:
     # Method/Field FQN: contains '#'
     if "#" in q:
         out["fqn_substring"] = q
-        out["preferred_types"] = {"method"}
+        out["preferred_types"] = _METHOD_TYPES
         out["boost_factor"] = _BOOST_FQN_MATCH
         return out
 
@@ -121,11 +138,11 @@ def _detect_query_kind(query: str) -> dict:
     if " " not in q and q.isidentifier():
         if q[0].isupper() and any(c.islower() for c in q[1:]):
             # PascalCase → class name
-            out["preferred_types"] = {"class"}
+            out["preferred_types"] = _CLASS_TYPES
             out["boost_factor"] = _BOOST_CLASS
         elif q[0].islower() and (any(c.isupper() for c in q) or "_" in q):
             # camelCase or snake_case → method name
-            out["preferred_types"] = {"method"}
+            out["preferred_types"] = _METHOD_TYPES
             out["boost_factor"] = _BOOST_METHOD
     return out
 
@@ -152,11 +169,13 @@ def _apply_pagerank_boost(
     if pr_range <= 0:
         return ranked  # all same PR (likely all 0) → boost has no effect
 
-    boosted: list[tuple[str, tuple[float, dict]]] = []
-    for (fqn, (score, ranks)), pr in zip(ranked, prs):
-        norm = (pr - pr_min) / pr_range  # [0, 1]
-        mult = 1.0 + weight * norm
-        boosted.append((fqn, (score * mult, ranks)))
+    # mult = 1 + weight * (pr - pr_min) / pr_range, with the constant part
+    # folded once: one multiply-add per candidate, no per-item division.
+    scale = weight / pr_range
+    boosted = [
+        (fqn, (score * (1.0 + (pr - pr_min) * scale), ranks))
+        for (fqn, (score, ranks)), pr in zip(ranked, prs)
+    ]
     boosted.sort(key=lambda x: -x[1][0])
     return boosted
 
@@ -170,7 +189,7 @@ def _apply_kind_boost(
 
     Re-sorts after boosting. Safe no-op if hint is empty.
     """
-    preferred = hint.get("preferred_types") or set()
+    preferred = hint.get("preferred_types") or _NO_TYPES
     boost = hint.get("boost_factor", 1.0)
     substr = hint.get("fqn_substring", "")
 
@@ -212,6 +231,54 @@ def _rrf_fuse(rankings: dict[str, list[str]], k: int = RRF_K) -> dict[str, tuple
     return {fqn: (score, ranks_by_fqn[fqn]) for fqn, score in scores.items()}
 
 
+# `_graph_direct` Cypher, built once at import. The FQN branch used to
+# f-string a fresh query per label on every call; the rest were inline
+# literals re-concatenated per call. Same text, now module constants.
+_ROUTE_MATCH_CYPHER = """
+    MATCH (h:Method)-[:HANDLES]->(e:Endpoint)
+    WHERE e.path CONTAINS $path
+"""
+_ROUTE_METHOD_FILTER = " AND e.httpMethod = $method"
+# Use e.id (matches FTS / semantic output format "METHOD:/path").
+# Mixing formats here breaks RRF merging with other sources.
+_ROUTE_RETURN_CYPHER = """
+    RETURN e.id AS fqn,
+           'endpoint' AS type,
+           h.filePath AS filePath,
+           h.lineStart AS lineStart,
+           h.lineEnd AS lineEnd,
+           1.0 AS score
+    LIMIT $n
+"""
+# FQN fragments match methods first, then classes, in one round-trip.
+# UNION ALL keeps branch order, so the old "methods, then classes if
+# there is room" result is the head of this list after the final slice.
+_FQN_CONTAINS_CYPHER = " UNION ALL ".join(
+    f"MATCH (n:{label}) WHERE n.fqn CONTAINS $q "
+    f"RETURN n.fqn AS fqn, '{label.lower()}' AS type, "
+    f"n.filePath AS filePath, n.lineStart AS lineStart, "
+    f"n.lineEnd AS lineEnd, 0.9 AS score LIMIT $n"
+    for label in ("Method", "Class")
+)
+# Name lookups score exact hits 1.0 and substring hits 0.8 in one pass.
+# Exact matches always satisfy CONTAINS, so ordering by score first keeps
+# the old "exact, then CONTAINS by name" ranking without a second query.
+_CLASS_NAME_CYPHER = (
+    "MATCH (c:Class) WHERE c.name CONTAINS $q "
+    "WITH c, CASE WHEN c.name = $q THEN 1.0 ELSE 0.8 END AS score "
+    "RETURN c.fqn AS fqn, 'class' AS type, c.filePath AS filePath, "
+    "c.lineStart AS lineStart, c.lineEnd AS lineEnd, score "
+    "ORDER BY score DESC, c.name LIMIT $n"
+)
+_METHOD_NAME_CYPHER = (
+    "MATCH (m:Method) WHERE m.name CONTAINS $q AND m.external IS NULL "
+    "WITH m, CASE WHEN m.name = $q THEN 1.0 ELSE 0.8 END AS score "
+    "RETURN m.fqn AS fqn, 'method' AS type, m.filePath AS filePath, "
+    "m.lineStart AS lineStart, m.lineEnd AS lineEnd, score "
+    "ORDER BY score DESC, m.name LIMIT $n"
+)
+
+
 def _graph_direct(db, query: str, hint: dict, n: int) -> list[RetrievalHit]:
     """Fast-path: direct Cypher match for structural queries.
 
@@ -223,7 +290,7 @@ def _graph_direct(db, query: str, hint: dict, n: int) -> list[RetrievalHit]:
     if not q:
         return []
 
-    preferred = hint.get("preferred_types", set())
+    preferred = hint.get("preferred_types", _NO_TYPES)
     is_route = hint.get("is_route", False)
     fqn_sub = hint.get("fqn_substring", "")
 
@@ -236,79 +303,25 @@ def _graph_direct(db, query: str, hint: dict, n: int) -> list[RetrievalHit]:
             path = parts[1] if len(parts) > 1 and parts[0].upper() in _HTTP_VERBS else parts[0]
             http_method = parts[0].upper() if len(parts) > 1 and parts[0].upper() in _HTTP_VERBS else ""
 
-            cypher = """
-                MATCH (h:Method)-[:HANDLES]->(e:Endpoint)
-                WHERE e.path CONTAINS $path
-            """
-            params: dict = {"path": path}
+            params: dict = {"path": path, "n": n}
             if http_method:
-                cypher += " AND e.httpMethod = $method"
+                cypher = _ROUTE_MATCH_CYPHER + _ROUTE_METHOD_FILTER + _ROUTE_RETURN_CYPHER
                 params["method"] = http_method
-            # Use e.id (matches FTS / semantic output format "METHOD:/path").
-            # Mixing formats here breaks RRF merging with other sources.
-            cypher += """
-                RETURN e.id AS fqn,
-                       'endpoint' AS type,
-                       h.filePath AS filePath,
-                       h.lineStart AS lineStart,
-                       h.lineEnd AS lineEnd,
-                       1.0 AS score
-                LIMIT $n
-            """
-            params["n"] = n
+            else:
+                cypher = _ROUTE_MATCH_CYPHER + _ROUTE_RETURN_CYPHER
             results = db.query(cypher, params) or []
 
         elif fqn_sub:
             # FQN fragment: contains '#' or '.'
-            for label in ("Method", "Class"):
-                if len(results) >= n:
-                    break
-                rows = db.query(
-                    f"MATCH (n:{label}) WHERE n.fqn CONTAINS $q "
-                    f"RETURN n.fqn AS fqn, '{label.lower()}' AS type, "
-                    f"n.filePath AS filePath, n.lineStart AS lineStart, "
-                    f"n.lineEnd AS lineEnd, 0.9 AS score LIMIT $n",
-                    {"q": fqn_sub, "n": n},
-                ) or []
-                results.extend(rows)
+            results = db.query(_FQN_CONTAINS_CYPHER, {"q": fqn_sub, "n": n}) or []
 
         elif "class" in preferred:
-            # PascalCase → exact class name match first, then CONTAINS
-            rows = db.query(
-                "MATCH (c:Class {name: $q}) "
-                "RETURN c.fqn AS fqn, 'class' AS type, c.filePath AS filePath, "
-                "c.lineStart AS lineStart, c.lineEnd AS lineEnd, 1.0 AS score LIMIT $n",
-                {"q": q, "n": n},
-            ) or []
-            results.extend(rows)
-            if len(results) < n:
-                more = db.query(
-                    "MATCH (c:Class) WHERE c.name CONTAINS $q "
-                    "RETURN c.fqn AS fqn, 'class' AS type, c.filePath AS filePath, "
-                    "c.lineStart AS lineStart, c.lineEnd AS lineEnd, 0.8 AS score "
-                    "ORDER BY c.name LIMIT $n",
-                    {"q": q, "n": n - len(results)},
-                ) or []
-                results.extend(more)
+            # PascalCase → exact class name matches ranked ahead of CONTAINS
+            results = db.query(_CLASS_NAME_CYPHER, {"q": q, "n": n}) or []
 
         elif "method" in preferred:
             # camelCase/snake_case → method name match
-            rows = db.query(
-                "MATCH (m:Method) WHERE m.name = $q AND m.external IS NULL "
-                "RETURN m.fqn AS fqn, 'method' AS type, m.filePath AS filePath, "
-                "m.lineStart AS lineStart, m.lineEnd AS lineEnd, 1.0 AS score LIMIT $n",
-                {"q": q, "n": n},
-            ) or []
-            results.extend(rows)
-            if len(results) < n:
-                more = db.query(
-                    "MATCH (m:Method) WHERE m.name CONTAINS $q AND m.external IS NULL "
-                    "RETURN m.fqn AS fqn, 'method' AS type, m.filePath AS filePath, "
-                    "m.lineStart AS lineStart, m.lineEnd AS lineEnd, 0.8 AS score "
-                    "ORDER BY m.name LIMIT $n",
-                    {"q": q, "n": n - len(results)},
-                ) or []
-                results.extend(more)
+            results = db.query(_METHOD_NAME_CYPHER, {"q": q, "n": n}) or []
         else:
             return []
 
@@ -340,7 +353,7 @@ def _fts_search(db, query: str, fanout: int) -> list[str]:
     from onelens.graph.analysis import search_code
 
     try:
-        results = search_code(db, query, "")
+        results = search_code(db, query, "", limit=fanout, fqn_only=True)
     except Exception as e:
         logger.warning("FTS search failed: %s", e)
         return []
@@ -382,96 +395,60 @@ def _semantic_search(
     return fqns, meta
 
 
+# Method, Class and Endpoint probes in one round-trip. Branch order is the
+# old probe order, so "first match wins" still prefers Method, then Class.
+# Endpoints resolve their location through the handler method and carry no
+# pagerank of their own.
+_LOCATIONS_BATCH_CYPHER = """
+UNWIND $fqns AS fqn
+MATCH (m:Method {fqn: fqn})
+RETURN 'method' AS type, m.fqn AS fqn, m.filePath AS filePath,
+       m.lineStart AS lineStart, m.lineEnd AS lineEnd, m.pagerank AS pagerank
+UNION ALL
+UNWIND $fqns AS fqn
+MATCH (c:Class {fqn: fqn})
+RETURN 'class' AS type, c.fqn AS fqn, c.filePath AS filePath,
+       c.lineStart AS lineStart, c.lineEnd AS lineEnd, c.pagerank AS pagerank
+UNION ALL
+UNWIND $fqns AS fqn
+MATCH (e:Endpoint {id: fqn})
+MATCH (h:Method)-[:HANDLES]->(e)
+RETURN 'endpoint' AS type, e.id AS fqn, h.filePath AS filePath,
+       h.lineStart AS lineStart, h.lineEnd AS lineEnd, null AS pagerank
+"""
+
+
 def _fetch_locations_batch(db, fqns: list[str]) -> dict[str, dict]:
     """Fetch {filePath, lineStart, lineEnd, type} for a list of FQNs in one pass.
 
-    Probes Method, Class, and Endpoint labels in sequence — first match wins.
-    One round-trip per label, regardless of how many FQNs.
+    Probes Method, Class, and Endpoint labels — first match wins. A single
+    UNION ALL round-trip regardless of how many FQNs or labels. Method and
+    Class hits also carry pagerank (populated at import time; missing
+    pagerank on pre-B1 graphs / external methods is tolerated as 0.0).
     """
-    locations: dict[str, dict] = {}
-    remaining = set(fqns)
-    if not remaining:
+    if not fqns:
         return {}
 
-    # Methods — also pull pagerank when present (populated at import time).
-    # Missing pagerank is tolerated (pre-B1 graphs, external methods).
+    locations: dict[str, dict] = {}
     try:
-        rows = db.query(
-            """
-            UNWIND $fqns AS fqn
-            MATCH (m:Method {fqn: fqn})
-            RETURN m.fqn AS fqn, m.filePath AS filePath,
-                   m.lineStart AS lineStart, m.lineEnd AS lineEnd,
-                   m.pagerank AS pagerank
-            """,
-            {"fqns": list(remaining)},
-        )
-        for r in rows:
-            fqn = r.get("fqn", "")
-            if fqn:
-                locations[fqn] = {
-                    "type": "method",
-                    "filePath": r.get("filePath", "") or "",
-                    "lineStart": r.get("lineStart", 0) or 0,
-                    "lineEnd": r.get("lineEnd", 0) or 0,
-                    "pagerank": r.get("pagerank") or 0.0,
-                }
-                remaining.discard(fqn)
+        rows = db.query(_LOCATIONS_BATCH_CYPHER, {"fqns": list(set(fqns))})
     except Exception as e:
-        logger.debug("Method location lookup failed: %s", e)
-
-    # Classes — pull pagerank too (Class.pagerank is sum of its methods' PRs).
-    if remaining:
-        try:
-            rows = db.query(
-                """
-                UNWIND $fqns AS fqn
-                MATCH (c:Class {fqn: fqn})
-                RETURN c.fqn AS fqn, c.filePath AS filePath,
-                       c.lineStart AS lineStart, c.lineEnd AS lineEnd,
-                       c.pagerank AS pagerank
-                """,
-                {"fqns": list(remaining)},
-            )
-            for r in rows:
-                fqn = r.get("fqn", "")
-                if fqn:
-                    locations[fqn] = {
-                        "type": "class",
-                        "filePath": r.get("filePath", "") or "",
-                        "lineStart": r.get("lineStart", 0) or 0,
-                        "lineEnd": r.get("lineEnd", 0) or 0,
-                        "pagerank": r.get("pagerank") or 0.0,
-                    }
-                    remaining.discard(fqn)
-        except Exception as e:
-            logger.debug("Class location lookup failed: %s", e)
-
-    # Endpoints (resolve via handler method)
-    if remaining:
-        try:
-            rows = db.query(
-                """
-                UNWIND $fqns AS fqn
-                MATCH (e:Endpoint {id: fqn})
-                MATCH (h:Method)-[:HANDLES]->(e)
-                RETURN e.id AS fqn, h.filePath AS filePath,
-                       h.lineStart AS lineStart, h.lineEnd AS lineEnd
-                """,
-                {"fqns": list(remaining)},
-            )
-            for r in rows:
-                fqn = r.get("fqn", "")
-                if fqn:
-                    locations[fqn] = {
-                        "type": "endpoint",
-                        "filePath": r.get("filePath", "") or "",
-                        "lineStart": r.get("lineStart", 0) or 0,
-                        "lineEnd": r.get("lineEnd", 0) or 0,
-                    }
-        except Exception as e:
-            logger.debug("Endpoint location lookup failed: %s", e)
+        logger.debug("Location lookup failed: %s", e)
+        return {}
 
+    for r in rows:
+        fqn = r.get("fqn", "")
+        if not fqn or fqn in locations:
+            continue
+        loc = {
+            "type": r.get("type", "unknown"),
+            "filePath": r.get("filePath", "") or "",
+            "lineStart": r.get("lineStart", 0) or 0,
+            "lineEnd": r.get("lineEnd", 0) or 0,
+        }
+        if loc["type"] != "endpoint":
+            loc["pagerank"] = r.get("pagerank") or 0.0
+        locations[fqn] = loc
     return locations
 
 
@@ -494,37 +471,81 @@ def _read_snippet(
         line_end = line_start + max_lines
     line_end = min(line_end, line_start + max_lines)
 
+    # Stream to line_end and stop — readlines() decoded and held the whole
+    # file (generated sources run to tens of MB) to keep at most 80 lines.
     try:
         with open(full_path, "r", encoding="utf-8", errors="replace") as f:
-            lines = f.readlines()
+            return "".join(islice(f, line_start - 1, line_end)).rstrip()
     except OSError as e:
         logger.debug("Could not read %s: %s", full_path, e)
         return ""
 
-    return "".join(lines[line_start - 1 : line_end]).rstrip()
 
+def _attach_snippets(hits: list[RetrievalHit], project_root: str) -> None:
+    """Fill `snippet` for every hit with a file, reading files concurrently.
 
-def _fetch_neighbors(db, fqn: str, limit: int = 5) -> tuple[list[str], list[str]]:
-    """Direct callers and callees of a method (1-hop each)."""
-    callers: list[str] = []
-    callees: list[str] = []
-    try:
-        rows = db.query(
-            "MATCH (c:Method)-[:CALLS]->(m:Method {fqn: $fqn}) RETURN DISTINCT c.fqn AS fqn LIMIT $lim",
-            {"fqn": fqn, "lim": limit},
-        )
-        callers = [r.get("fqn", "") for r in rows if r.get("fqn")]
-    except Exception:
-        pass
-    try:
-        rows = db.query(
-            "MATCH (m:Method {fqn: $fqn})-[:CALLS]->(c:Method) RETURN DISTINCT c.fqn AS fqn LIMIT $lim",
-            {"fqn": fqn, "lim": limit},
+    Each read is a small blocking open+scan; on a cold page cache the pool's
+    ~40 reads one after another dominate retrieve latency. A bounded thread
+    pool overlaps them without opening every file at once.
+    """
+    todo = [h for h in hits if h.file_path]
+    if not todo:
+        return
+    workers = _env_int("ONELENS_SNIPPET_WORKERS", DEFAULT_SNIPPET_WORKERS)
+    if len(todo) == 1 or workers == 1:
+        for h in todo:
+            h.snippet = _read_snippet(h.file_path, h.line_start, h.line_end, project_root)
+        return
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, len(todo))) as ex:
+        snippets = ex.map(
+            lambda h: _read_snippet(h.file_path, h.line_start, h.line_end, project_root), todo
         )
-        callees = [r.get("fqn", "") for r in rows if r.get("fqn")]
-    except Exception:
-        pass
-    return callers, callees
+        for h, snippet in zip(todo, snippets):
+            h.snippet = snippet
+
+
+_CALLERS_BATCH_CYPHER = """
+    UNWIND $fqns AS fqn
+    MATCH (c:Method)-[:CALLS]->(m:Method {fqn: fqn})
+    WITH fqn, collect(DISTINCT c.fqn) AS nbrs
+    RETURN fqn, nbrs[0..$lim] AS nbrs
+"""
+_CALLEES_BATCH_CYPHER = """
+    UNWIND $fqns AS fqn
+    MATCH (m:Method {fqn: fqn})-[:CALLS]->(c:Method)
+    WITH fqn, collect(DISTINCT c.fqn) AS nbrs
+    RETURN fqn, nbrs[0..$lim] AS nbrs
+"""
+
+
+def _attach_neighbors(db, hits: list[RetrievalHit], limit: int = 5) -> None:
+    """Fill direct callers / callees (1-hop each) on every method hit.
+
+    One UNWIND query per direction for the whole hit list — previously two
+    round-trips per hit (20 sequential queries for a top-10 retrieve). The
+    two directions are independent and run concurrently; the backend's
+    in-flight cap still bounds load on the server.
+    """
+    fqns = [h.fqn for h in hits if h.type == "method"]
+    if not fqns:
+        return
+    params = {"fqns": fqns, "lim": limit}
+
+    def _neighbors(cypher: str) -> dict[str, list[str]]:
+        try:
+            rows = db.query(cypher, params) or []
+        except Exception:
+            return {}
+        return {r["fqn"]: [f for f in (r.get("nbrs") or []) if f] for r in rows}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as ex:
+        callers_future = ex.submit(_neighbors, _CALLERS_BATCH_CYPHER)
+        callees_future = ex.submit(_neighbors, _CALLEES_BATCH_CYPHER)
+        found = {"callers": callers_future.result(), "callees": callees_future.result()}
+    for h in hits:
+        if h.type == "method":
+            h.callers = found["callers"].get(h.fqn, [])
+            h.callees = found["callees"].get(h.fqn, [])
 
 
 def hybrid_retrieve(
@@ -566,8 +587,8 @@ def hybrid_retrieve(
         return []
 
     # Stage 0: query router — structural queries hit graph first. Graph hits
-    # feed into RRF as a third source "graph". Only shortcircuit (skip
-    # FTS+semantic+rerank entirely) when the query is a clear exact-symbol
+    # feed into RRF as a third source "graph". Only shortcircuit (return the
+    # graph hits without fusion or rerank) when the query is a clear exact-symbol
     # match (PascalCase class name or FQN with '#'), where graph gives
     # canonical ground truth. Route queries and CONTAINS-style lookups fall
     # through to hybrid because they're too fuzzy to trust graph-only.
@@ -575,33 +596,44 @@ def hybrid_retrieve(
     _graph_fqns: list[str] = []
     _shortcircuit_ok = (
         bool(hint.get("fqn_substring"))
-        or ("class" in hint.get("preferred_types", set()))
+        or ("class" in hint.get("preferred_types", _NO_TYPES))
     )
-    if hint.get("preferred_types") or hint.get("is_route") or hint.get("fqn_substring"):
-        graph_hits = _graph_direct(db, query, hint, n_results)
-        # Only shortcircuit when the TOP hit is a clean exact/prefix match
-        # (score >= 1.0 means the exact-match branch fired in _graph_direct).
-        if (
-            _shortcircuit_ok
-            and graph_hits
-            and graph_hits[0].score >= 1.0
-            and len(graph_hits) >= n_results
-        ):
-            if include_snippets:
-                for h in graph_hits:
-                    if h.file_path:
-                        h.snippet = _read_snippet(h.file_path, h.line_start, h.line_end, project_root)
-            if include_neighbors:
-                for h in graph_hits:
-                    if h.type == "method":
-                        h.callers, h.callees = _fetch_neighbors(db, h.fqn)
-            return graph_hits
-        _graph_fqns = [h.fqn for h in graph_hits]
-
-    # Stage 1: parallel retrieval
+
+    # Stage 1: parallel retrieval. A query that can never shortcircuit needs
+    # FTS + semantic regardless, so it starts them before the router's graph
+    # lookup and overlaps the two. An exact-symbol query runs the lookup
+    # first: a shortcircuit must not pay for an embedder pass it discards.
     with concurrent.futures.ThreadPoolExecutor(max_workers=2) as ex:
-        fts_future = ex.submit(_fts_search, db, query, fanout)
-        sem_future = ex.submit(_semantic_search, query, context_path, graph, fanout)
+        stage1 = None
+        if not _shortcircuit_ok:
+            stage1 = (
+                ex.submit(_fts_search, db, query, fanout),
+                ex.submit(_semantic_search, query, context_path, graph, fanout),
+            )
+
+        if hint.get("preferred_types") or hint.get("is_route") or hint.get("fqn_substring"):
+            graph_hits = _graph_direct(db, query, hint, n_results)
+            # Only shortcircuit when the TOP hit is a clean exact/prefix match
+            # (score >= 1.0 means the exact-match branch fired in _graph_direct).
+            if (
+                _shortcircuit_ok
+                and graph_hits
+                and graph_hits[0].score >= 1.0
+                and len(graph_hits) >= n_results
+            ):
+                if include_snippets:
+                    _attach_snippets(graph_hits, project_root)
+                if include_neighbors:
+                    _attach_neighbors(db, graph_hits)
+                return graph_hits
+            _graph_fqns = [h.fqn for h in graph_hits]
+
+        if stage1 is None:
+            stage1 = (
+                ex.submit(_fts_search, db, query, fanout),
+                ex.submit(_semantic_search, query, context_path, graph, fanout),
+            )
+        fts_future, sem_future = stage1
         fts_fqns = fts_future.result()
         sem_fqns, sem_meta = sem_future.result()
 
@@ -656,20 +688,28 @@ def hybrid_retrieve(
             rank_semantic=ranks.get("semantic"),
         )
 
-        if need_snippets and hit.file_path:
-            hit.snippet = _read_snippet(hit.file_path, hit.line_start, hit.line_end, project_root)
-
         hits.append(hit)
 
-    # Stage 5: optional cross-encoder rerank on the pool, then truncate
-    # Skip if no document text (reranker needs content; snippet or context_text)
+    if need_snippets:
+        _attach_snippets(hits, project_root)
+
+    # Stage 5: optional cross-encoder rerank on the pool, then truncate.
+    # Skip if no document text (reranker needs content; snippet or context_text).
+    # The precision floor is applied inside the reranker on its score vector:
+    # drops hits where the cross-encoder score indicates no real semantic
+    # match, which protects gibberish (and off-topic) queries from returning
+    # plausible-looking noise at the top. Rejected hits never get a score
+    # attached or a slot in the result list.
+    min_score = float(
+        os.environ.get("ONELENS_MIN_RERANK_SCORE", DEFAULT_MIN_RERANK_SCORE)
+    )
     has_text = any((h.snippet or h.context_text) for h in hits)
     if rerank and hits and has_text:
         from .reranker import get_default_reranker
 
         try:
             reranker = get_default_reranker()
-            hits = reranker.rerank(query, hits, top_k=n_results)
+            hits = reranker.rerank(query, hits, top_k=n_results, min_score=min_score)
         except Exception as e:
             logger.warning("Rerank failed, returning RRF order: %s", e)
             hits = hits[:n_results]
@@ -678,20 +718,8 @@ def hybrid_retrieve(
             logger.info("Skipping rerank: no snippets or context text available")
         hits = hits[:n_results]
 
-    # Stage 5b: precision filter — drop hits where the cross-encoder score
-    # indicates no real semantic match. Protects against gibberish queries
-    # (and off-topic retrieval) returning plausible-looking noise at the top.
-    # Only applies when rerank ran (rerank_score is set).
-    min_score = float(
-        os.environ.get("ONELENS_MIN_RERANK_SCORE", DEFAULT_MIN_RERANK_SCORE)
-    )
-    if hits and hits[0].rerank_score is not None:
-        hits = [h for h in hits if h.rerank_score is None or h.rerank_score >= min_score]
-
     # Stage 6: neighbors (only for final top-K, not the whole pool)
     if include_neighbors:
-        for hit in hits:
-            if hit.type == "method":
-                hit.callers, hit.callees = _fetch_neighbors(db, hit.fqn)
+        _attach_neighbors(db, hits)
 
     return hits
@@ -35,6 +35,20 @@ def build_where_filter(
     return {}
 
 
+def similarities(distances) -> list[float]:
+    """Chroma distances -> similarity scores (1 - distance, floored at 0, 3dp).
+
+    One vectorized pass over the result row instead of a boxed-float
+    `round(max(0.0, 1 - d), 3)` per hit. numpy comes with chromadb, so it
+    is imported here rather than at module load (graph-only installs import
+    this module via layers/retrieval).
+    """
+    import numpy as np
+
+    sims = np.clip(1.0 - np.asarray(distances, dtype=np.float64), 0.0, None)
+    return np.round(sims, 3).tolist()
+
+
 def search_context(
     query: str,
     context_path: str,
@@ -90,23 +104,32 @@ def search_context(
     except Exception as e:
         return {"error": f"Search error: {e}"}
 
+    import numpy as np
+
     docs = results["documents"][0]
     metas = results["metadatas"][0]
-    dists = results["distances"][0]
+    dists = np.asarray(results["distances"][0], dtype=np.float64)
+
+    # Threshold, similarity and rounding as whole-row array ops; the loop
+    # only visits kept rows.
+    keep = range(len(docs))
+    if max_distance > 0.0:
+        keep = np.flatnonzero(dists <= max_distance).tolist()
+    sims = similarities(dists)
+    rounded = np.round(dists, 4).tolist()
 
     hits = []
-    for doc, meta, dist in zip(docs, metas, dists):
-        if max_distance > 0.0 and dist > max_distance:
-            continue
+    for i in keep:
+        meta = metas[i]
         hits.append({
-            "text": doc,
+            "text": docs[i],
             "fqn": meta.get("fqn", ""),
             "type": meta.get("type", ""),
             "wing": meta.get("wing", ""),
             "room": meta.get("room", ""),
             "importance": meta.get("importance", 0.0),
-            "similarity": round(max(0.0, 1 - dist), 3),
-            "distance": round(dist, 4),
+            "similarity": sims[i],
+            "distance": rounded[i],
         })
 
     return {
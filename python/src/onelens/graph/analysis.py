@@ -1,5 +1,7 @@
 """High-level impact analysis functions."""
 
+import concurrent.futures
+
 from onelens.graph.db import GraphDB
 from onelens.graph import queries
 
@@ -22,22 +24,40 @@ def get_callees(db: GraphDB, method_fqn: str, depth: int = 2) -> list[dict]:
     return db.query(cypher, params)
 
 
-def search_code(db: GraphDB, term: str, node_type: str = "") -> list[dict]:
+_FTS_NODE_TYPES = ("class", "method", "endpoint")
+
+
+def _search_one_type(db: GraphDB, term: str, node_type: str, limit: int | None = None,
+                     fqn_only: bool = False) -> list[dict]:
+    cypher, params = queries.search(term, node_type, limit, fqn_only)
+    try:
+        return db.query(cypher, params)
+    except Exception:
+        return []  # FTS index may not exist for this type yet
+
+
+def search_code(db: GraphDB, term: str, node_type: str = "", limit: int | None = None,
+                fqn_only: bool = False) -> list[dict]:
     """Full-text search across the knowledge graph.
 
     Runs separate queries per node type and merges results,
     because FalkorDB may not support UNION with CALL...YIELD.
+    The per-type queries are independent, so they're issued concurrently —
+    latency is the slowest FTS lookup rather than the sum of all three.
+    Results keep the class, method, endpoint order.
+
+    `limit` is applied per type, server-side: callers that only keep the
+    first N rows never need more than N from any one type. `fqn_only` rows
+    carry just `fqn`.
     """
-    results = []
-    types_to_search = [node_type] if node_type else ["class", "method", "endpoint"]
+    if node_type:
+        return _search_one_type(db, term, node_type, limit, fqn_only)
 
-    for nt in types_to_search:
-        cypher, params = queries.search(term, nt)
-        try:
-            results.extend(db.query(cypher, params))
-        except Exception:
-            pass  # FTS index may not exist for this type yet
-    return results
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(_FTS_NODE_TYPES)) as ex:
+        per_type = list(ex.map(
+            lambda nt: _search_one_type(db, term, nt, limit, fqn_only), _FTS_NODE_TYPES
+        ))
+    return [row for rows in per_type for row in rows]
 
 
 def get_entry_points(db: GraphDB) -> list[dict]:
@@ -46,9 +66,12 @@ def get_entry_points(db: GraphDB) -> list[dict]:
     return db.query(cypher, params)
 
 
+_ACCESSOR_PREFIXES = ("get", "set", "is")
+
+
 def _is_trivial_accessor(method_name: str, fqn: str) -> bool:
     """Check if method is a simple getter/setter (0-1 params, name starts with get/set/is)."""
-    if not (method_name.startswith("get") or method_name.startswith("set") or method_name.startswith("is")):
+    if not method_name.startswith(_ACCESSOR_PREFIXES):
         return False
     # Count params from FQN: Class#method(P1,P2) — count commas inside parens
     if "#" in fqn and "(" in fqn:
@@ -167,38 +190,30 @@ def _expand_with_overrides(db: GraphDB, fqns: set[str]) -> set[str]:
 
 
 def _direct_callers(db: GraphDB, fqns: set[str]) -> list[dict]:
-    """All methods that directly :CALLS any FQN in `fqns`. One round-trip."""
+    """All methods that directly :CALLS any FQN in `fqns`. One round-trip.
+
+    Rows carry `target_fqn` (which of `fqns` was called), so a caller of
+    several targets appears once per target. `endpoint` is set when the
+    caller is itself a REST handler (one row per endpoint it handles), so
+    the impact walk needs no separate handler lookup per hop.
+    """
     if not fqns:
         return []
     rows = db.query(
         """
         UNWIND $fqns AS fqn
         MATCH (caller:Method)-[:CALLS]->(target:Method {fqn: fqn})
+        OPTIONAL MATCH (caller)-[:HANDLES]->(e:Endpoint)
         RETURN DISTINCT caller.fqn AS caller_fqn, caller.classFqn AS className,
                         caller.name AS method, caller.filePath AS file,
-                        caller.lineStart AS line
+                        caller.lineStart AS line, target.fqn AS target_fqn,
+                        e.httpMethod + ' ' + e.path AS endpoint
         """,
         {"fqns": list(fqns)},
     )
     return rows
 
 
-def _handlers_among(db: GraphDB, fqns: set[str]) -> list[dict]:
-    """Which of `fqns` are REST endpoint handlers? One round-trip."""
-    if not fqns:
-        return []
-    return db.query(
-        """
-        UNWIND $fqns AS fqn
-        MATCH (m:Method {fqn: fqn})-[:HANDLES]->(e:Endpoint)
-        RETURN m.fqn AS fqn, m.classFqn AS className, m.name AS handler,
-               m.filePath AS file, m.lineStart AS line,
-               e.httpMethod + ' ' + e.path AS endpoint
-        """,
-        {"fqns": list(fqns)},
-    )
-
-
 # A type counts as "generic base" — and therefore useless for narrowing
 # polymorphic callers — once more than this many classes implement or extend
 # it. Below this, an interface-with-few-impls unambiguously points to the
@@ -208,9 +223,9 @@ def _handlers_among(db: GraphDB, fqns: set[str]) -> list[dict]:
 _GENERIC_BASE_SUBCLASS_THRESHOLD = 10
 
 
-def _compatible_bean_types(db: GraphDB, target_class_fqn: str) -> set[str]:
-    """Return the specific types that a field holding our target impl's bean
-    could be declared as. Excludes generic bases (types implemented/extended
+def _compatible_bean_types(db: GraphDB, target_class_fqns: set[str]) -> set[str]:
+    """Return the specific types that a field holding any of our target impls'
+    beans could be declared as. Excludes generic bases (types implemented/extended
     by more than `_GENERIC_BASE_SUBCLASS_THRESHOLD` classes), since filtering
     controllers by "has-a-field-of-type-AbstractBaseService" retains every
     Spring service in the codebase.
@@ -224,17 +239,25 @@ def _compatible_bean_types(db: GraphDB, target_class_fqn: str) -> set[str]:
     is a no-op; if we only keep specific interfaces/impls, the filter correctly
     identifies which controllers actually inject a bean that could dispatch
     through our target impl.
+
+    Takes the whole set of targets at once: the union of per-target results
+    is the same set (subclass counts are global), and the two queries run
+    once instead of once per target class.
     """
+    if not target_class_fqns:
+        return set()
+
     ancestors = db.query(
         """
-        MATCH (impl:Class {fqn: $fqn})-[:IMPLEMENTS|EXTENDS*0..5]->(t:Class)
+        UNWIND $fqns AS f
+        MATCH (impl:Class {fqn: f})-[:IMPLEMENTS|EXTENDS*0..5]->(t:Class)
         RETURN DISTINCT t.fqn AS fqn
         """,
-        {"fqn": target_class_fqn},
+        {"fqns": list(target_class_fqns)},
     )
     ancestor_fqns = [a["fqn"] for a in ancestors if a.get("fqn")]
     if not ancestor_fqns:
-        return {target_class_fqn}
+        return set(target_class_fqns)
 
     counts = db.query(
         """
@@ -246,9 +269,9 @@ def _compatible_bean_types(db: GraphDB, target_class_fqn: str) -> set[str]:
     )
     sub_count = {c["fqn"]: c["n"] for c in counts}
 
-    compatible: set[str] = {target_class_fqn}
+    compatible: set[str] = set(target_class_fqns)
     for fqn in ancestor_fqns:
-        if fqn == target_class_fqn:
+        if fqn in compatible:
             continue
         if sub_count.get(fqn, 0) <= _GENERIC_BASE_SUBCLASS_THRESHOLD:
             compatible.add(fqn)
@@ -348,6 +371,9 @@ def get_impacted_endpoints(
     precision: dict[str, str] = {method_fqn: "precise"}
     visited: set[str] = {method_fqn}
     found: dict[str, dict] = {}   # endpoint string -> row (first hop wins)
+    # Classes of the target's own direct callers, captured from hop 1 for the
+    # bean-type filter below (saves re-querying them).
+    target_caller_classes: set[str] = set()
 
     for hop in range(1, depth + 1):
         if polymorphic:
@@ -359,6 +385,11 @@ def get_impacted_endpoints(
             expanded = frontier
 
         rows = _direct_callers(db, expanded)
+        if hop == 1:
+            target_caller_classes = {
+                r["className"] for r in rows
+                if r.get("target_fqn") == method_fqn and r.get("className")
+            }
         caller_fqns = {r["caller_fqn"] for r in rows if r.get("caller_fqn")}
         caller_fqns -= visited
         if not caller_fqns:
@@ -375,10 +406,10 @@ def get_impacted_endpoints(
             if precision.get(cfqn) != "precise":
                 precision[cfqn] = new_label
 
-        handlers = _handlers_among(db, caller_fqns)
-        for h in handlers:
-            ep = h.get("endpoint", "")
-            if ep and ep not in found:
+        # Handlers among this hop's new callers come back on the caller rows.
+        for h in rows:
+            ep = h.get("endpoint")
+            if ep and ep not in found and h.get("caller_fqn") in caller_fqns:
                 ctrl = h.get("className", "")
                 short_ctrl = ctrl.rsplit(".", 1)[-1] if "." in ctrl else ctrl
                 file_path = h.get("file", "") or ""
@@ -388,10 +419,10 @@ def get_impacted_endpoints(
                 found[ep] = {
                     "endpoint": ep,
                     "controller": short_ctrl,
-                    "handler": h.get("handler", ""),
+                    "handler": h.get("method", ""),
                     "location": loc,
                     "hops": hop,
-                    "precision": precision.get(h["fqn"], "polymorphic"),
+                    "precision": precision.get(h["caller_fqn"], "polymorphic"),
                     "_handler_class_fqn": ctrl,   # stripped before return
                 }
 
@@ -422,22 +453,18 @@ def get_impacted_endpoints(
     if polymorphic and bean_type_filter:
         poly_hits = [v for v in found.values() if v.get("precision") == "polymorphic"]
         if poly_hits:
-            compatible: set[str] = set()
-
-            # Source 1: target's own class ancestors. Always runs — covers the
-            # template-method case where direct_callers is empty.
+            # Source 1: target's own class ancestors. Always included — covers
+            # the template-method case where direct_callers is empty.
             target_class_fqn = method_fqn.split("#", 1)[0] if "#" in method_fqn else ""
-            if target_class_fqn:
-                compatible |= _compatible_bean_types(db, target_class_fqn)
+            seed_classes = {target_class_fqn} if target_class_fqn else set()
 
             # Source 2: direct callers' classes and their ancestors. Covers the
             # entity-method case where target's class doesn't appear in fields.
-            direct_caller_rows = _direct_callers(db, {method_fqn})
-            caller_classes = {
-                r["className"] for r in direct_caller_rows if r.get("className")
-            }
-            for cc in caller_classes:
-                compatible |= _compatible_bean_types(db, cc)
+            seed_classes |= target_caller_classes
+
+            # Both sources resolved together — two queries total rather than
+            # two per caller class.
+            compatible = _compatible_bean_types(db, seed_classes)
 
             if compatible:
                 handler_class_fqns = {
@@ -1,29 +1,168 @@
 """FalkorDB backend — requires Redis/Docker server running."""
 
+import logging
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+
+from onelens.context.config import _env_int
 from onelens.graph.db import GraphDB
 
+try:
+    from redis.exceptions import ConnectionError as _RedisConnectionError
+    from redis.exceptions import TimeoutError as _RedisTimeoutError
+except ImportError:  # falkordb always ships redis; guard keeps import-time safe
+    _RedisConnectionError = _RedisTimeoutError = ConnectionError  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Reads retry on dropped/refused connections with exponential backoff + jitter:
+# FalkorDB restarts (Docker, `onelens` plugin preflight) and idle sockets
+# reaped by the OS otherwise fail a whole retrieve on the first blip.
+# Writes (`execute`) are NOT retried — bulk CREATE batches aren't idempotent.
+_TRANSIENT_ERRORS = (_RedisConnectionError, _RedisTimeoutError, ConnectionError)
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_S = 0.2
+
+# Cap on in-flight queries per server. Retrieval fans out (FTS per type,
+# semantic, neighbors) and the daemon serves requests from a thread pool, so
+# unbounded we can open one socket per concurrent query and queue them all
+# on FalkorDB's fixed worker pool anyway. Excess callers wait here instead.
+DEFAULT_GRAPH_CONCURRENCY = 8
+
+
+def _graph_concurrency() -> int:
+    return _env_int("ONELENS_GRAPH_CONCURRENCY", DEFAULT_GRAPH_CONCURRENCY)
+
+
+# The index a schema DDL statement creates, as (label, property, "RANGE") or
+# (label, frozenset of fields, "FULLTEXT") — a label has one full-text index
+# covering all its fields. Used to skip statements whose index already
+# exists; anything unrecognized is always sent.
+_RANGE_DDL_RE = re.compile(r"\(n:(\w+)\) ON \(n\.(\w+)\)")
+_FULLTEXT_DDL_RE = re.compile(r"fulltext\.createNodeIndex\(\s*'(\w+)'")
+_FULLTEXT_FIELD_RE = re.compile(r"field: '(\w+)'")
+
+
+def _ddl_target(ddl: str) -> tuple | None:
+    if m := _RANGE_DDL_RE.search(ddl):
+        return m[1], m[2], "RANGE"
+    if (m := _FULLTEXT_DDL_RE.search(ddl)) and (fields := _FULLTEXT_FIELD_RE.findall(ddl)):
+        return m[1], frozenset(fields), "FULLTEXT"
+    return None
+
+
+# One FalkorDB client (and therefore one redis connection pool) per server.
+# The MCP daemon opens a backend per graph and the importers build their own;
+# without sharing, every handle paid a fresh TCP connect and kept its own
+# idle sockets. Graph handles are cheap views over the shared client.
+_CLIENTS: dict[tuple[str, int], tuple[object, threading.BoundedSemaphore]] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _shared_client(host: str, port: int):
+    """Return (client, in-flight semaphore) for a server, creating it once."""
+    key = (host, port)
+    entry = _CLIENTS.get(key)
+    if entry is None:
+        with _CLIENTS_LOCK:
+            entry = _CLIENTS.get(key)
+            if entry is None:
+                from falkordb import FalkorDB
+
+                # TCP keepalive on the pooled sockets: the daemon can sit
+                # idle for hours, and without probes NATs / Docker's proxy
+                # drop the connection silently, so the next query pays a
+                # failure + retry + reconnect. redis-py already sets
+                # TCP_NODELAY, so small queries aren't held back by Nagle.
+                entry = _CLIENTS[key] = (
+                    FalkorDB(host=host, port=port, socket_keepalive=True),
+                    threading.BoundedSemaphore(_graph_concurrency()),
+                )
+    return entry
+
 
 class FalkorDBBackend(GraphDB):
     """FalkorDB server backend (Redis-based, requires Docker or standalone server)."""
 
     def __init__(self, host: str = "localhost", port: int = 17532, graph_name: str = "onelens"):
-        from falkordb import FalkorDB
-
-        self._db = FalkorDB(host=host, port=port)
+        self._db, self._slots = _shared_client(host, port)
         self._graph = self._db.select_graph(graph_name)
 
+    def _read(self, cypher: str, params: dict | None):
+        for attempt in range(_RETRY_ATTEMPTS):
+            try:
+                with self._slots:
+                    result = self._graph.query(cypher, params=params or {})
+                break
+            except _TRANSIENT_ERRORS as e:
+                if attempt == _RETRY_ATTEMPTS - 1:
+                    raise
+                # Back off outside the semaphore so waiting doesn't hold a slot.
+                delay = _RETRY_BASE_S * (2 ** attempt) + random.uniform(0, _RETRY_BASE_S)
+                logger.warning("FalkorDB query failed (%s); retrying in %.2fs", e, delay)
+                time.sleep(delay)
+        return result
+
     def query(self, cypher: str, params: dict | None = None) -> list[dict]:
-        result = self._graph.query(cypher, params=params or {})
-        rows = []
+        return list(self.iter_rows(cypher, params))
+
+    def iter_rows(self, cypher: str, params: dict | None = None):
+        result = self._read(cypher, params)
         if result.result_set:
             # FalkorDB header format: [[type_id, 'column_name'], ...]
             columns = [h[1] if isinstance(h, list) else h for h in result.header]
             for row in result.result_set:
-                rows.append(dict(zip(columns, row)))
-        return rows
+                yield dict(zip(columns, row))
 
     def execute(self, cypher: str, params: dict | None = None) -> None:
-        self._graph.query(cypher, params=params or {})
+        with self._slots:
+            self._graph.query(cypher, params=params or {})
+
+    def _existing_indexes(self) -> set[tuple]:
+        """Every index on the graph in `_ddl_target`'s shape, one query."""
+        existing = set()
+        fulltext: dict[str, set[str]] = defaultdict(set)
+        for row in self.iter_rows("CALL db.indexes()"):
+            label = row.get("label")
+            types = row.get("types")
+            if isinstance(types, dict):  # {property: [kind, ...]}
+                pairs = [(prop, str(k).upper()) for prop, kinds in types.items() for k in kinds]
+            else:
+                kind = str(row.get("type", "")).upper()
+                pairs = [(prop, kind) for prop in row.get("properties") or []]
+            for prop, kind in pairs:
+                if kind == "FULLTEXT":
+                    fulltext[label].add(prop)
+                else:
+                    existing.add((label, prop, kind))
+        existing.update((label, frozenset(props), "FULLTEXT") for label, props in fulltext.items())
+        return existing
+
+    def execute_ddl(self, statements) -> None:
+        """All DDL in one pipelined round-trip instead of one per index.
+
+        Indexes that already exist are listed first (one read) and their
+        statements dropped: every delta sync re-runs the schema, and each
+        re-create is a write query that takes the graph lock just to fail.
+        Errors ("already indexed") come back in the pipeline's results rather
+        than being raised, and don't stop the remaining statements.
+        """
+        statements = list(statements)
+        try:
+            existing = self._existing_indexes()
+            statements = [ddl for ddl in statements if _ddl_target(ddl) not in existing]
+        except Exception:
+            pass  # Can't list indexes (e.g. graph not created yet): send all
+        if not statements:
+            return
+        pipe = self._db.connection.pipeline(transaction=False)
+        for ddl in statements:
+            pipe.execute_command("GRAPH.QUERY", self._graph.name, ddl, "--compact")
+        with self._slots:
+            pipe.execute(raise_on_error=False)
 
     def clear(self) -> None:
         # Delete the whole graph key, not just nodes — this also drops FTS/vector
@@ -39,4 +178,6 @@ class FalkorDBBackend(GraphDB):
         self._graph = self._db.select_graph(self._graph.name)
 
     def close(self) -> None:
+        # The client is shared per server (see _CLIENTS); other handles may
+        # still be using its pool, so there is nothing per-handle to release.
         pass
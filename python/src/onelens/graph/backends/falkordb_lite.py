@@ -16,13 +16,14 @@ class FalkorDBLiteBackend(GraphDB):
         self._graph = self._db.select_graph(graph_name)
 
     def query(self, cypher: str, params: dict | None = None) -> list[dict]:
+        return list(self.iter_rows(cypher, params))
+
+    def iter_rows(self, cypher: str, params: dict | None = None):
         result = self._graph.query(cypher, params=params or {})
-        rows = []
         if result.result_set:
             columns = [h[1] if isinstance(h, list) else h for h in result.header]
             for row in result.result_set:
-                rows.append(dict(zip(columns, row)))
-        return rows
+                yield dict(zip(columns, row))
 
     def execute(self, cypher: str, params: dict | None = None) -> None:
         self._graph.query(cypher, params=params or {})
@@ -1,27 +1,93 @@
 """Neo4j backend — requires Neo4j server running."""
 
+import hashlib
+import threading
+from contextlib import contextmanager
+
 from onelens.graph.db import GraphDB
 
+# One driver (and therefore one Bolt connection pool) per (uri, user,
+# password), as the FalkorDB backend shares one client per server. The MCP
+# daemon opens a backend per graph name, and every one of them points at the
+# same server; separate drivers each paid their own connect + auth handshake
+# and kept their own idle connections. The password is keyed by its digest
+# so a changed credential gets a fresh driver instead of the stale one.
+_DRIVERS: dict[tuple[str, str, str], object] = {}
+_DRIVERS_LOCK = threading.Lock()
+
+
+def _driver_key(uri: str, user: str, password: str) -> tuple[str, str, str]:
+    return (uri, user, hashlib.sha256(password.encode()).hexdigest())
+
+
+def _shared_driver(uri: str, user: str, password: str):
+    key = _driver_key(uri, user, password)
+    driver = _DRIVERS.get(key)
+    if driver is None:
+        with _DRIVERS_LOCK:
+            driver = _DRIVERS.get(key)
+            if driver is None:
+                from neo4j import GraphDatabase
+
+                driver = _DRIVERS[key] = GraphDatabase.driver(uri, auth=(user, password))
+    return driver
+
+
+def _evict_driver(key: tuple[str, str, str], driver) -> None:
+    """Drop a driver that failed auth so the next call builds a new one.
+
+    Only evicts if `driver` is still the cached one — a concurrent caller may
+    already have replaced it. The driver is not closed: other threads may
+    still have sessions open on it, and it is released once they finish.
+    """
+    with _DRIVERS_LOCK:
+        if _DRIVERS.get(key) is driver:
+            del _DRIVERS[key]
+
 
 class Neo4jBackend(GraphDB):
     """Neo4j server backend (JVM-based, requires standalone server or Docker)."""
 
     def __init__(self, uri: str = "bolt://localhost:7687", user: str = "neo4j", password: str = "neo4j"):
-        from neo4j import GraphDatabase
+        self._conn = (uri, user, password)
+        _shared_driver(uri, user, password)
+
+    @contextmanager
+    def _session(self):
+        # Looked up per call rather than pinned on the handle, so a driver
+        # evicted after a failure is replaced for long-lived handles too.
+        driver = _shared_driver(*self._conn)
+        from neo4j.exceptions import AuthError
 
-        self._driver = GraphDatabase.driver(uri, auth=(user, password))
+        # Only auth failures evict: after a server restart or a network
+        # blip the driver reconnects by itself.
+        try:
+            with driver.session() as session:
+                yield session
+        except AuthError:
+            _evict_driver(_driver_key(*self._conn), driver)
+            raise
 
     def query(self, cypher: str, params: dict | None = None) -> list[dict]:
-        with self._driver.session() as session:
+        with self._session() as session:
             result = session.run(cypher, params or {})
             return [dict(record) for record in result]
 
+    def iter_rows(self, cypher: str, params: dict | None = None):
+        # Records stream off the Bolt connection as the session is consumed.
+        with self._session() as session:
+            for record in session.run(cypher, params or {}):
+                yield dict(record)
+
     def execute(self, cypher: str, params: dict | None = None) -> None:
-        with self._driver.session() as session:
+        with self._session() as session:
             session.run(cypher, params or {})
 
     def clear(self) -> None:
         self.execute("MATCH (n) DETACH DELETE n")
 
     def close(self) -> None:
-        self._driver.close()
+        # The driver is shared per server (see _DRIVERS); other handles may
+        # still be using its pool, so there is nothing per-handle to release.
+        # A driver that fails auth is evicted in _session.
+        pass
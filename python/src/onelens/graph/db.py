@@ -7,8 +7,8 @@ Queries use Cypher — compatible with FalkorDB, FalkorDBLite, Neo4j, Memgraph.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from rich.console import Console
-from rich.table import Table
+from collections.abc import Iterable, Iterator
+from importlib import import_module
 
 # Node types used across all backends
 NODE_TYPES = ["Class", "Method", "Field", "SpringBean", "Endpoint", "Module", "Annotation"]
@@ -26,6 +26,14 @@ class GraphDB(ABC):
         """Execute a Cypher query and return results as list of dicts."""
         ...
 
+    def iter_rows(self, cypher: str, params: dict | None = None) -> Iterator[dict]:
+        """Yield result rows one at a time instead of building the full list.
+
+        For whole-graph scans (every CALLS edge, every HAS_METHOD pair) where
+        the caller folds rows into its own structure. Default: wraps `query`.
+        """
+        yield from self.query(cypher, params)
+
     @abstractmethod
     def execute(self, cypher: str, params: dict | None = None) -> None:
         """Execute a Cypher statement (no return value)."""
@@ -41,6 +49,46 @@ class GraphDB(ABC):
         """Close the connection."""
         ...
 
+    def node_counts(self, labels: Iterable[str]) -> dict[str, int]:
+        """Node count per label, in one round-trip.
+
+        One UNION ALL branch per label instead of a `count(n)` query each;
+        labels with no nodes count 0. If the combined query fails (one bad
+        label fails all of it), falls back to one query per label and leaves
+        out the labels that still fail, so the others still report.
+        """
+        labels = list(labels)
+        cypher = " UNION ALL ".join(
+            f"MATCH (n:{label}) RETURN '{label}' AS label, count(n) AS cnt" for label in labels
+        )
+        try:
+            rows = self.query(cypher)
+        except Exception:
+            counts = {}
+            for label in labels:
+                try:
+                    result = self.query(f"MATCH (n:{label}) RETURN count(n) AS cnt")
+                    counts[label] = int(result[0]["cnt"]) if result else 0
+                except Exception:
+                    pass
+            return counts
+        counts = {label: 0 for label in labels}
+        for row in rows:
+            counts[row["label"]] = int(row["cnt"])
+        return counts
+
+    def execute_ddl(self, statements: Iterable[str]) -> None:
+        """Run idempotent DDL (index creation), ignoring per-statement failures.
+
+        Re-creating an existing index errors on most backends; callers treat
+        that as success. Default: one `execute` per statement.
+        """
+        for ddl in statements:
+            try:
+                self.execute(ddl)
+            except Exception:
+                pass  # Index already exists
+
     def create_schema(self, node_ddls: dict[str, str], rel_ddls: dict[str, str]) -> None:
         """Create node and relationship tables/indexes. Default: execute each DDL."""
         for ddl in node_ddls.values():
@@ -50,22 +98,31 @@ class GraphDB(ABC):
 
     def print_stats(self) -> None:
         """Print node and edge counts."""
+        # Imported here: every backend and the daemon's query path import this
+        # module, and only this CLI printout needs rich's console/table stack.
+        from rich.console import Console
+        from rich.table import Table
+
         console = Console()
         table = Table(title="Graph Statistics")
         table.add_column("Type", style="cyan")
         table.add_column("Count", style="green", justify="right")
 
-        for nt in NODE_TYPES:
-            try:
-                result = self.query(f"MATCH (n:{nt}) RETURN count(n) AS cnt")
-                count = result[0]["cnt"] if result else 0
-                table.add_row(nt, str(count))
-            except Exception:
-                pass
+        for nt, count in self.node_counts(NODE_TYPES).items():
+            table.add_row(nt, str(count))
 
         console.print(table)
 
 
+# backend name -> (module, class). Modules are imported on first use so a
+# FalkorDB-only install never needs the neo4j / redislite packages.
+_BACKENDS: dict[str, tuple[str, str]] = {
+    "falkordblite": ("onelens.graph.backends.falkordb_lite", "FalkorDBLiteBackend"),
+    "falkordb": ("onelens.graph.backends.falkordb_backend", "FalkorDBBackend"),
+    "neo4j": ("onelens.graph.backends.neo4j_backend", "Neo4jBackend"),
+}
+
+
 def create_backend(backend: str = "falkordblite", **kwargs) -> GraphDB:
     """Factory function to create a graph DB backend.
 
@@ -76,14 +133,11 @@ def create_backend(backend: str = "falkordblite", **kwargs) -> GraphDB:
     Returns:
         A GraphDB instance.
     """
-    if backend == "falkordblite":
-        from onelens.graph.backends.falkordb_lite import FalkorDBLiteBackend
-        return FalkorDBLiteBackend(**kwargs)
-    elif backend == "falkordb":
-        from onelens.graph.backends.falkordb_backend import FalkorDBBackend
-        return FalkorDBBackend(**kwargs)
-    elif backend == "neo4j":
-        from onelens.graph.backends.neo4j_backend import Neo4jBackend
-        return Neo4jBackend(**kwargs)
-    else:
-        raise ValueError(f"Unknown backend: {backend}. Choose: falkordblite, falkordb, neo4j")
+    try:
+        module_name, class_name = _BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown backend: {backend}. Choose: {', '.join(_BACKENDS)}"
+        ) from None
+    cls = getattr(import_module(module_name), class_name)
+    return cls(**kwargs)
@@ -135,43 +135,54 @@ def _escape_fts_term(term: str) -> str:
     return term.replace("\\", "\\\\").replace("'", "\\'")
 
 
-def search(term: str, node_type: str = "") -> tuple[str, dict]:
+# node_type -> (FTS index, extra WHERE, full RETURN, fqn expression).
+# Unknown types fall back to classes (callers loop for multi-type).
+_FTS_TARGETS = {
+    "class": (
+        "Class", "",
+        "RETURN 'Class' AS type, node.fqn AS fqn, node.name AS name, "
+        "node.filePath AS file, node.kind AS kind",
+        "node.fqn",
+    ),
+    "method": (
+        "Method", "WHERE node.external IS NULL",
+        "RETURN 'Method' AS type, node.fqn AS fqn, node.name AS name, "
+        "node.filePath AS file, '' AS kind",
+        "node.fqn",
+    ),
+    "endpoint": (
+        "Endpoint", "",
+        "RETURN 'Endpoint' AS type, node.id AS fqn, node.path AS name, "
+        "node.httpMethod AS file, '' AS kind",
+        "node.id",
+    ),
+}
+
+
+def search(term: str, node_type: str = "", limit: int | None = None,
+           fqn_only: bool = False) -> tuple[str, dict]:
     """Full-text search for a single node type.
 
     FalkorDB CALL procedures don't support $param — must embed term as literal.
     Call this once per node type; use search_code() in analysis.py for multi-type.
 
-    Supports prefix (User*), fuzzy (%auth%1), and exact matching.
+    Supports prefix (User*), fuzzy (%auth%1), and exact matching. `limit`
+    caps the rows the server returns (hits arrive best-score first, so the
+    cap keeps the top `limit`). `fqn_only` projects just the `fqn` column,
+    for callers that only rank identifiers (hybrid retrieve).
     """
     safe_term = _escape_fts_term(term)
-
-    if node_type == "class":
-        cypher = f"""
-            CALL db.idx.fulltext.queryNodes('Class', '{safe_term}') YIELD node
-            RETURN 'Class' AS type, node.fqn AS fqn, node.name AS name,
-                   node.filePath AS file, node.kind AS kind
-        """
-    elif node_type == "method":
-        cypher = f"""
-            CALL db.idx.fulltext.queryNodes('Method', '{safe_term}') YIELD node
-            WHERE node.external IS NULL
-            RETURN 'Method' AS type, node.fqn AS fqn, node.name AS name,
-                   node.filePath AS file, '' AS kind
-        """
-    elif node_type == "endpoint":
-        cypher = f"""
-            CALL db.idx.fulltext.queryNodes('Endpoint', '{safe_term}') YIELD node
-            RETURN 'Endpoint' AS type, node.id AS fqn, node.path AS name,
-                   node.httpMethod AS file, '' AS kind
+    label, where, returns, fqn_expr = _FTS_TARGETS.get(node_type, _FTS_TARGETS["class"])
+    if fqn_only:
+        returns = f"RETURN {fqn_expr} AS fqn"
+
+    cypher = f"""
+            CALL db.idx.fulltext.queryNodes('{label}', '{safe_term}') YIELD node
+            {where}
+            {returns}
         """
-    else:
-        # Default: search classes (caller should loop for multi-type)
-        cypher = f"""
-            CALL db.idx.fulltext.queryNodes('Class', '{safe_term}') YIELD node
-            RETURN 'Class' AS type, node.fqn AS fqn, node.name AS name,
-                   node.filePath AS file, node.kind AS kind
-        """
-
+    if limit is not None:
+        cypher += f"LIMIT {int(limit)}"
     return cypher, {}
 
 
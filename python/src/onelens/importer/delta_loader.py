@@ -1,10 +1,11 @@
 """Delta (incremental) import into any Cypher-compatible graph DB."""
 
-import json
+import concurrent.futures
 import logging
 from pathlib import Path
 
 from onelens.graph.db import GraphDB
+from onelens.importer.export_io import load_export, split_class_fqn, split_method_fqn
 
 logger = logging.getLogger(__name__)
 
@@ -28,30 +29,34 @@ class DeltaLoader:
            provided. Uses CodeMiner's deterministic IDs — incremental re-embed
            is O(changed methods), not full re-mine.
         """
-        with open(delta_path) as f:
-            data = json.load(f)
+        data = load_export(delta_path)
 
         deleted = data.get("deleted", {})
         upserted = data.get("upserted", {})
 
-        # 1. Delete classes (DETACH DELETE cascades edges)
+        # 1. Delete classes with their methods and fields (DETACH DELETE
+        # cascades edges). One statement per batch: each label's matches are
+        # collected per class FQN (indexed lookups, no cross product) and
+        # deleted together, instead of a round-trip per label.
         deleted_classes = [fqn for fqn in deleted.get("classes", []) if fqn]
         for batch in self._chunks(deleted_classes, BATCH_SIZE):
-            self.db.execute(
-                "UNWIND $batch AS fqn MATCH (c:Class {fqn: fqn}) DETACH DELETE c",
-                {"batch": batch}
-            )
-            self.db.execute(
-                "UNWIND $batch AS fqn MATCH (m:Method {classFqn: fqn}) DETACH DELETE m",
-                {"batch": batch}
-            )
-            self.db.execute(
-                "UNWIND $batch AS fqn MATCH (f:Field {classFqn: fqn}) DETACH DELETE f",
-                {"batch": batch}
-            )
-        logger.info(f"Deleted {len(deleted_classes)} classes")
-
-        # 2. Upsert classes (batched)
+            self.db.execute("""
+                UNWIND $batch AS fqn
+                OPTIONAL MATCH (c:Class {fqn: fqn})
+                WITH fqn, collect(c) AS cs
+                OPTIONAL MATCH (m:Method {classFqn: fqn})
+                WITH fqn, cs, collect(m) AS ms
+                OPTIONAL MATCH (f:Field {classFqn: fqn})
+                WITH cs, ms, collect(f) AS fs
+                UNWIND cs + ms + fs AS n
+                DETACH DELETE n
+            """, {"batch": batch})
+        logger.info("Deleted %d classes", len(deleted_classes))
+
+        # 2. Upsert classes (batched). Rows are built with exactly the
+        # properties to write, so each is merged onto its node as one map
+        # (`SET n += item`) rather than one `n.p = item.p` per property;
+        # properties not in the row (pagerank, external) are left as-is.
         classes = upserted.get("classes", [])
         for batch in self._chunks(classes, BATCH_SIZE):
             items = [{
@@ -63,12 +68,12 @@ class DeltaLoader:
             self.db.execute("""
                 UNWIND $batch AS item
                 MERGE (c:Class {fqn: item.fqn})
-                SET c.name = item.name, c.kind = item.kind, c.filePath = item.filePath,
-                    c.packageName = item.packageName, c.superClass = item.superClass,
-                    c.lineStart = item.lineStart, c.lineEnd = item.lineEnd
+                SET c += item
             """, {"batch": items})
 
-        # 3. Upsert methods (batched)
+        # 3. Upsert methods (batched), linking each to its class in the same
+        # statement: the class was upserted above, so HAS_METHOD needs no
+        # second edge list or round-trip per batch.
         methods = upserted.get("methods", [])
         for batch in self._chunks(methods, BATCH_SIZE):
             items = [{
@@ -82,22 +87,13 @@ class DeltaLoader:
             self.db.execute("""
                 UNWIND $batch AS item
                 MERGE (m:Method {fqn: item.fqn})
-                SET m.name = item.name, m.classFqn = item.classFqn, m.returnType = item.returnType,
-                    m.isConstructor = item.isConstructor, m.filePath = item.filePath,
-                    m.lineStart = item.lineStart, m.lineEnd = item.lineEnd,
-                    m.body = item.body, m.javadoc = item.javadoc
-            """, {"batch": items})
-
-        # HAS_METHOD edges for upserted methods
-        has_method = [{"src": m.get("classFqn", ""), "dst": m["fqn"]} for m in methods if m.get("classFqn")]
-        for batch in self._chunks(has_method, BATCH_SIZE):
-            self.db.execute("""
-                UNWIND $batch AS edge
-                MATCH (c:Class {fqn: edge.src}), (m:Method {fqn: edge.dst})
+                SET m += item
+                WITH m, item WHERE item.classFqn <> ''
+                MATCH (c:Class {fqn: item.classFqn})
                 MERGE (c)-[:HAS_METHOD]->(m)
-            """, {"batch": batch})
+            """, {"batch": items})
 
-        # 4. Upsert fields (batched)
+        # 4. Upsert fields (batched), with HAS_FIELD as for methods
         fields = upserted.get("fields", [])
         for batch in self._chunks(fields, BATCH_SIZE):
             items = [{
@@ -108,17 +104,11 @@ class DeltaLoader:
             self.db.execute("""
                 UNWIND $batch AS item
                 MERGE (f:Field {fqn: item.fqn})
-                SET f.name = item.name, f.classFqn = item.classFqn, f.type = item.type,
-                    f.filePath = item.filePath
-            """, {"batch": items})
-
-        has_field = [{"src": f.get("classFqn", ""), "dst": f["fqn"]} for f in fields if f.get("classFqn")]
-        for batch in self._chunks(has_field, BATCH_SIZE):
-            self.db.execute("""
-                UNWIND $batch AS edge
-                MATCH (c:Class {fqn: edge.src}), (f:Field {fqn: edge.dst})
+                SET f += item
+                WITH f, item WHERE item.classFqn <> ''
+                MATCH (c:Class {fqn: item.classFqn})
                 MERGE (c)-[:HAS_FIELD]->(f)
-            """, {"batch": batch})
+            """, {"batch": items})
 
         # 5. Create external stub nodes for call targets not in graph
         upserted_class_fqns = {c["fqn"] for c in classes}
@@ -132,7 +122,7 @@ class DeltaLoader:
             if callee and callee not in upserted_method_fqns:
                 ext_method_fqns.add(callee)
                 if "#" in callee:
-                    ext_class_fqns.add(callee.split("#")[0])
+                    ext_class_fqns.add(callee.partition("#")[0])
 
         for edge in upserted.get("inheritance", []):
             parent = edge.get("parentFqn", "")
@@ -144,13 +134,12 @@ class DeltaLoader:
             if parent and parent not in upserted_method_fqns:
                 ext_method_fqns.add(parent)
                 if "#" in parent:
-                    ext_class_fqns.add(parent.split("#")[0])
+                    ext_class_fqns.add(parent.partition("#")[0])
 
         # Batch create external class stubs
         ext_class_items = []
         for fqn in ext_class_fqns:
-            name = fqn.split(".")[-1] if "." in fqn else fqn
-            pkg = fqn.rsplit(".", 1)[0] if "." in fqn else ""
+            pkg, name = split_class_fqn(fqn)
             ext_class_items.append({"fqn": fqn, "name": name, "pkg": pkg})
 
         for batch in self._chunks(ext_class_items, BATCH_SIZE):
@@ -166,11 +155,8 @@ class DeltaLoader:
         ext_method_items = []
         ext_has_method = []
         for fqn in ext_method_fqns:
-            class_fqn = fqn.split("#")[0] if "#" in fqn else ""
-            name = fqn.split("#")[1].split("(")[0] if "#" in fqn else fqn
-            class_simple = class_fqn.split(".")[-1] if class_fqn else ""
-            if "$" in class_simple:
-                class_simple = class_simple.split("$")[-1]
+            class_fqn, name = split_method_fqn(fqn)
+            class_simple = class_fqn.rpartition(".")[2].rpartition("$")[2]
             is_constructor = (name == class_simple) if class_fqn else False
             ext_method_items.append({
                 "fqn": fqn, "name": name, "classFqn": class_fqn,
@@ -236,11 +222,7 @@ class DeltaLoader:
 
         # 9. Ensure full-text search indexes exist (idempotent)
         from onelens.importer.schema import FULLTEXT_SCHEMA
-        for ddl in FULLTEXT_SCHEMA.values():
-            try:
-                self.db.execute(ddl)
-            except Exception:
-                pass
+        self.db.execute_ddl(FULLTEXT_SCHEMA.values())
 
         # 9b. Replace-all Spring layer (beans, endpoints, injections, HANDLES)
         # and Modules. Spring wiring is cross-class — per-class diff would miss
@@ -256,64 +238,76 @@ class DeltaLoader:
 
         stats = data.get("stats", {})
 
-        # 10. Optional: propagate the delta into the ChromaDB semantic layer.
-        # Deterministic drawer IDs (`method:<fqn>`, `class:<fqn>`) mean we can
-        # upsert just the changed entities — full re-mine on every file save
-        # would be unusable (20 min). Changed methods / classes re-embed;
-        # deleted ones are purged by ID. External stubs are skipped (they
-        # have no body to embed).
-        if context and graph_name:
-            try:
-                from onelens.miners.code_miner import CodeMiner
-
-                miner = CodeMiner(graph_name)
-
-                # Purge drawers for deleted classes + cascade their methods.
-                # Classes go by exact ID (`class:<fqn>`). Methods cascade via
-                # metadata filter — each method drawer was written with its
-                # owning `class` FQN, so one Chroma delete purges them all.
-                del_class_fqns = [fqn for fqn in deleted.get("classes", []) if fqn]
-                if del_class_fqns:
-                    miner.delete_by_ids([f"class:{fqn}" for fqn in del_class_fqns])
-                    miner.delete_methods_of_classes(del_class_fqns)
-
-                # Upsert changed methods + classes from `upserted`.
-                # Build a synthetic "mini export" shape CodeMiner accepts.
-                mini = {
-                    "classes": classes,
-                    "methods": methods,
-                    "callGraph": upserted.get("callGraph", []),
-                }
+        # 11 runs first, on a worker thread. PageRank reads and writes only
+        # the graph; the context layer (10) reads the delta export and writes
+        # only Chroma. So the NetworkX solve overlaps the re-embed instead
+        # of queueing behind it.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            pagerank_future = pool.submit(self._refresh_pagerank)
+
+            # 10. Optional: propagate the delta into the ChromaDB semantic layer.
+            # Deterministic drawer IDs (`method:<fqn>`, `class:<fqn>`) mean we can
+            # upsert just the changed entities — full re-mine on every file save
+            # would be unusable (20 min). Changed methods / classes re-embed;
+            # deleted ones are purged by ID. External stubs are skipped (they
+            # have no body to embed).
+            if context and graph_name:
                 try:
-                    ctx_stats = miner.mine_upserts(mini)
-                    stats["context"] = ctx_stats
-                except AttributeError:
-                    logger.info(
-                        "CodeMiner.mine_upserts not available; context layer "
-                        "will drift until next full --context import"
-                    )
-                    stats["context"] = {"skipped": "mine_upserts not implemented"}
-            except Exception as e:
-                logger.warning("Delta context mining failed: %s", e)
-                stats["context"] = {"error": str(e)}
-
-        # 11. Recompute PageRank. Topology changed (new nodes / edges or
-        # removed classes), so `Method.pagerank` / `Class.pagerank` are stale.
-        # Retrieval's multiplicative boost reads these — without a refresh,
-        # new endpoints / beans stay at pagerank=0 and rank below stale peers.
-        # NetworkX + graph read takes ~5-15s on 80K methods; acceptable for
-        # a delta that already paid for the graph round-trip.
+                    from onelens.miners.code_miner import CodeMiner
+
+                    miner = CodeMiner(graph_name)
+
+                    # Purge drawers for deleted classes + cascade their methods.
+                    # Classes go by exact ID (`class:<fqn>`). Methods cascade via
+                    # metadata filter — each method drawer was written with its
+                    # owning `class` FQN, so one Chroma delete purges them all.
+                    del_class_fqns = [fqn for fqn in deleted.get("classes", []) if fqn]
+                    if del_class_fqns:
+                        miner.delete_by_ids([f"class:{fqn}" for fqn in del_class_fqns])
+                        miner.delete_methods_of_classes(del_class_fqns)
+
+                    # Upsert changed methods + classes from `upserted`.
+                    # Build a synthetic "mini export" shape CodeMiner accepts.
+                    mini = {
+                        "classes": classes,
+                        "methods": methods,
+                        "callGraph": upserted.get("callGraph", []),
+                    }
+                    try:
+                        ctx_stats = miner.mine_upserts(mini)
+                        stats["context"] = ctx_stats
+                    except AttributeError:
+                        logger.info(
+                            "CodeMiner.mine_upserts not available; context layer "
+                            "will drift until next full --context import"
+                        )
+                        stats["context"] = {"skipped": "mine_upserts not implemented"}
+                except Exception as e:
+                    logger.warning("Delta context mining failed: %s", e)
+                    stats["context"] = {"error": str(e)}
+
+            stats["pagerank"] = pagerank_future.result()
+
+        logger.info("Delta applied: %s", stats)
+        return stats
+
+    def _refresh_pagerank(self) -> dict:
+        """Recompute PageRank after a delta. Returns stats, or an error entry.
+
+        Topology changed (new nodes / edges or removed classes), so
+        `Method.pagerank` / `Class.pagerank` are stale. Retrieval's
+        multiplicative boost reads these — without a refresh, new endpoints /
+        beans stay at pagerank=0 and rank below stale peers. NetworkX + graph
+        read takes ~5-15s on 80K methods; acceptable for a delta that already
+        paid for the graph round-trip.
+        """
         try:
             from onelens.importer import pagerank as _pr
 
-            pr_stats = _pr.run(self.db)
-            stats["pagerank"] = pr_stats
+            return _pr.run(self.db)
         except Exception as e:
             logger.warning("Delta PageRank refresh failed: %s", e)
-            stats["pagerank"] = {"error": str(e)}
-
-        logger.info(f"Delta applied: {stats}")
-        return stats
+            return {"error": str(e)}
 
     def _replace_spring(self, spring: dict) -> None:
         """Drop all SpringBean/Endpoint/HANDLES/INJECTS, then re-insert.
@@ -324,6 +318,10 @@ class DeltaLoader:
         renamed, and annotations can be added/removed without the
         annotated file showing up as "changed" if only a supertype
         changed.
+
+        Rows are inserted as whole property maps (`CREATE (n) SET n = item`),
+        the same shape the full loader uses, rather than a key property
+        plus one assignment per remaining column.
         """
         self.db.execute("MATCH (b:SpringBean) DETACH DELETE b")
         self.db.execute("MATCH (e:Endpoint) DETACH DELETE e")
@@ -337,9 +335,7 @@ class DeltaLoader:
         for batch in self._chunks(bean_items, BATCH_SIZE):
             self.db.execute("""
                 UNWIND $batch AS item
-                CREATE (b:SpringBean {name: item.name})
-                SET b.classFqn = item.classFqn, b.type = item.type,
-                    b.scope = item.scope, b.profile = item.profile
+                CREATE (b:SpringBean) SET b = item
             """, {"batch": batch})
 
         endpoints = spring.get("endpoints", []) or []
@@ -360,10 +356,7 @@ class DeltaLoader:
         for batch in self._chunks(ep_items, BATCH_SIZE):
             self.db.execute("""
                 UNWIND $batch AS item
-                CREATE (e:Endpoint {id: item.id})
-                SET e.path = item.path, e.httpMethod = item.httpMethod,
-                    e.controllerFqn = item.controllerFqn,
-                    e.handlerMethodFqn = item.handlerMethodFqn
+                CREATE (e:Endpoint) SET e = item
             """, {"batch": batch})
 
         for batch in self._chunks(handles, BATCH_SIZE):
@@ -403,7 +396,7 @@ class DeltaLoader:
         for batch in self._chunks(items, BATCH_SIZE):
             self.db.execute("""
                 UNWIND $batch AS item
-                CREATE (m:Module {name: item.name}) SET m.type = item.type
+                CREATE (m:Module) SET m = item
             """, {"batch": batch})
         logger.info("Modules replaced: %d", len(items))
 
@@ -1,18 +1,56 @@
 """Full JSON import into any Cypher-compatible graph DB using batch UNWIND."""
 
-import json
 import logging
 import time
+from collections.abc import Iterable, Iterator
+from itertools import chain, islice
 from pathlib import Path
 
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
 from onelens.graph.db import GraphDB
+from onelens.importer.export_io import load_export, split_class_fqn, split_method_fqn
 from onelens.importer.schema import NODE_SCHEMA, FULLTEXT_SCHEMA
 
 logger = logging.getLogger(__name__)
 
 NODE_BATCH = 1000
 EDGE_BATCH = 500
+# A failed UNWIND batch is halved until pieces are this small; only rows in
+# pieces that still fail fall through to the one-row-per-query fallback.
+BISECT_MIN = 8
+
+# Annotation targetKind -> source node label for ANNOTATED_WITH. Anything
+# else (FIELD, PARAMETER, ...) lands on Field, as before.
+_ANNOTATION_TARGET_LABEL = {"CLASS": "Class", "METHOD": "Method"}
+
+# Non-key properties written per node label. Module-level so the literals
+# aren't rebuilt per import, and the external/implicit stub writes share one
+# list instead of each repeating it inline.
+_CLASS_PROPS = (
+    "name", "kind", "filePath", "lineStart", "lineEnd",
+    "packageName", "enclosingClass", "superClass",
+)
+_METHOD_PROPS = (
+    "name", "classFqn", "returnType", "isConstructor",
+    "filePath", "lineStart", "lineEnd",
+    "body", "javadoc",
+)
+_FIELD_PROPS = ("name", "classFqn", "type", "filePath", "lineStart")
+_BEAN_PROPS = ("classFqn", "scope", "profile", "type")
+_ENDPOINT_PROPS = ("path", "httpMethod", "controllerFqn", "handlerMethodFqn")
+_EXT_CLASS_PROPS = (*_CLASS_PROPS, "external")
+# Stubs carry no source, so no body/javadoc.
+_EXT_METHOD_PROPS = (
+    "name", "classFqn", "returnType", "isConstructor",
+    "filePath", "lineStart", "lineEnd", "external",
+)
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to `size` items, pulling lazily from `items`."""
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
 
 
 class GraphLoader:
@@ -38,50 +76,29 @@ class GraphLoader:
 
             # Parse JSON
             task = progress.add_task("Loading JSON...", total=1)
-            with open(export_path) as f:
-                data = json.load(f)
+            data = load_export(export_path)
             progress.update(task, completed=1)
 
-            # Create indexes (idempotent)
-            task = progress.add_task("Creating indexes...", total=len(NODE_SCHEMA))
-            for i, (name, ddl) in enumerate(NODE_SCHEMA.items()):
-                try:
-                    self.db.execute(ddl)
-                except Exception:
-                    pass  # Index already exists
-                progress.update(task, completed=i + 1)
-
-            # Create full-text search indexes (idempotent)
-            task = progress.add_task("Creating full-text indexes...", total=len(FULLTEXT_SCHEMA))
-            for i, (name, ddl) in enumerate(FULLTEXT_SCHEMA.items()):
-                try:
-                    self.db.execute(ddl)
-                except Exception:
-                    pass  # Index already exists
-                progress.update(task, completed=i + 1)
+            # Create range + full-text search indexes (idempotent), as one
+            # DDL batch so backends can send them together.
+            ddls = [*NODE_SCHEMA.values(), *FULLTEXT_SCHEMA.values()]
+            task = progress.add_task("Creating indexes...", total=len(ddls))
+            self.db.execute_ddl(ddls)
+            progress.update(task, completed=len(ddls))
 
             # --- NODES ---
 
             classes = data.get("classes", [])
-            self._batch_nodes(progress, "Classes", classes, "Class", "fqn", [
-                "name", "kind", "filePath", "lineStart", "lineEnd",
-                "packageName", "enclosingClass", "superClass",
-            ])
+            self._batch_nodes(progress, "Classes", classes, "Class", "fqn", _CLASS_PROPS)
 
             methods = data.get("methods", [])
-            self._batch_nodes(progress, "Methods", methods, "Method", "fqn", [
-                "name", "classFqn", "returnType", "isConstructor",
-                "filePath", "lineStart", "lineEnd",
-                "body", "javadoc",
-            ])
+            self._batch_nodes(progress, "Methods", methods, "Method", "fqn", _METHOD_PROPS)
 
             fields = data.get("fields", [])
-            self._batch_nodes(progress, "Fields", fields, "Field", "fqn", [
-                "name", "classFqn", "type", "filePath", "lineStart",
-            ])
+            self._batch_nodes(progress, "Fields", fields, "Field", "fqn", _FIELD_PROPS)
 
             modules = data.get("modules", [])
-            self._batch_nodes(progress, "Modules", modules, "Module", "name", ["type"])
+            self._batch_nodes(progress, "Modules", modules, "Module", "name", ("type",))
 
             # Deduplicate annotations
             ann_fqns = set()
@@ -92,22 +109,18 @@ class GraphLoader:
                     ann_fqns.add(a.get("fqn", ""))
             ann_fqns.discard("")
             ann_nodes = [{"fqn": fqn, "name": fqn.split(".")[-1]} for fqn in ann_fqns]
-            self._batch_nodes(progress, "Annotations", ann_nodes, "Annotation", "fqn", ["name"])
+            self._batch_nodes(progress, "Annotations", ann_nodes, "Annotation", "fqn", ("name",))
 
             # Spring nodes
             spring = data.get("spring")
             if spring:
                 beans = spring.get("beans", [])
-                self._batch_nodes(progress, "Spring Beans", beans, "SpringBean", "name", [
-                    "classFqn", "scope", "profile", "type",
-                ])
+                self._batch_nodes(progress, "Spring Beans", beans, "SpringBean", "name", _BEAN_PROPS)
                 endpoints = spring.get("endpoints", [])
                 for ep in endpoints:
                     if "id" not in ep:
                         ep["id"] = f"{ep.get('httpMethod', 'GET')}:{ep.get('path', '/')}"
-                self._batch_nodes(progress, "Endpoints", endpoints, "Endpoint", "id", [
-                    "path", "httpMethod", "controllerFqn", "handlerMethodFqn",
-                ])
+                self._batch_nodes(progress, "Endpoints", endpoints, "Endpoint", "id", _ENDPOINT_PROPS)
 
             # --- EXTERNAL STUB NODES ---
             # Create stub nodes for external (library) classes/methods referenced in edges.
@@ -125,7 +138,7 @@ class GraphLoader:
                     ext_method_fqns.add(callee)
                     # Extract class FQN from method FQN (before #)
                     if "#" in callee:
-                        ext_class_fqns.add(callee.split("#")[0])
+                        ext_class_fqns.add(callee.partition("#")[0])
 
             # From inheritance: parent classes not in project
             for e in data.get("inheritance", []):
@@ -139,7 +152,7 @@ class GraphLoader:
                 if parent and parent not in project_method_fqns:
                     ext_method_fqns.add(parent)
                     if "#" in parent:
-                        ext_class_fqns.add(parent.split("#")[0])
+                        ext_class_fqns.add(parent.partition("#")[0])
 
             # Remove any external classes that are actually project classes
             ext_class_fqns -= project_class_fqns
@@ -147,18 +160,15 @@ class GraphLoader:
             # Create external class stubs
             ext_class_nodes = []
             for fqn in ext_class_fqns:
-                name = fqn.split(".")[-1] if "." in fqn else fqn
-                pkg = fqn.rsplit(".", 1)[0] if "." in fqn else ""
+                pkg, name = split_class_fqn(fqn)
                 ext_class_nodes.append({
                     "fqn": fqn, "name": name, "kind": "CLASS",
                     "filePath": "", "lineStart": 0, "lineEnd": 0,
                     "packageName": pkg, "enclosingClass": "", "superClass": "",
                     "external": True,
                 })
-            self._batch_nodes(progress, "External Classes", ext_class_nodes, "Class", "fqn", [
-                "name", "kind", "filePath", "lineStart", "lineEnd",
-                "packageName", "enclosingClass", "superClass", "external",
-            ])
+            self._batch_nodes(progress, "External Classes", ext_class_nodes, "Class", "fqn",
+                              _EXT_CLASS_PROPS)
 
             # Split method stubs into truly external vs project implicit constructors.
             # Project classes may have implicit default constructors that PSI doesn't export
@@ -166,12 +176,9 @@ class GraphLoader:
             ext_method_nodes = []
             implicit_method_nodes = []
             for fqn in ext_method_fqns:
-                class_fqn = fqn.split("#")[0] if "#" in fqn else ""
-                name = fqn.split("#")[1].split("(")[0] if "#" in fqn else fqn
+                class_fqn, name = split_method_fqn(fqn)
                 # Handle inner classes: com.example.Outer$Inner → constructor name is "Inner"
-                class_simple = class_fqn.split(".")[-1] if class_fqn else ""
-                if "$" in class_simple:
-                    class_simple = class_simple.split("$")[-1]
+                class_simple = class_fqn.rpartition(".")[2].rpartition("$")[2]
                 is_constructor = (name == class_simple) if class_fqn else False
                 is_project_class = class_fqn in project_class_fqns
                 node = {
@@ -185,15 +192,11 @@ class GraphLoader:
                 else:
                     ext_method_nodes.append(node)
 
-            self._batch_nodes(progress, "External Methods", ext_method_nodes, "Method", "fqn", [
-                "name", "classFqn", "returnType", "isConstructor",
-                "filePath", "lineStart", "lineEnd", "external",
-            ])
+            self._batch_nodes(progress, "External Methods", ext_method_nodes, "Method", "fqn",
+                              _EXT_METHOD_PROPS)
             if implicit_method_nodes:
-                self._batch_nodes(progress, "Implicit Methods", implicit_method_nodes, "Method", "fqn", [
-                    "name", "classFqn", "returnType", "isConstructor",
-                    "filePath", "lineStart", "lineEnd", "external",
-                ])
+                self._batch_nodes(progress, "Implicit Methods", implicit_method_nodes, "Method", "fqn",
+                                  _EXT_METHOD_PROPS)
 
             # HAS_METHOD for external + implicit methods → their classes
             ext_has_method = [{"src": m["classFqn"], "dst": m["fqn"]}
@@ -201,14 +204,21 @@ class GraphLoader:
 
             # --- EDGES ---
 
+            # The large edge sets are generators: rows are built one batch
+            # at a time as they are sent, instead of a full list of dicts
+            # per edge type held alongside the export. `total` sizes the
+            # progress bar.
+
             # HAS_METHOD (Class → Method)
-            has_method = [{"src": m["classFqn"], "dst": m["fqn"]} for m in methods]
-            has_method.extend(ext_has_method)
-            self._batch_edges(progress, "HAS_METHOD", has_method, "Class", "fqn", "Method", "fqn")
+            has_method = chain(({"src": m["classFqn"], "dst": m["fqn"]} for m in methods),
+                               ext_has_method)
+            self._batch_edges(progress, "HAS_METHOD", has_method, "Class", "fqn", "Method", "fqn",
+                              total=len(methods) + len(ext_has_method))
 
             # HAS_FIELD (Class → Field)
-            has_field = [{"src": f["classFqn"], "dst": f["fqn"]} for f in fields]
-            self._batch_edges(progress, "HAS_FIELD", has_field, "Class", "fqn", "Field", "fqn")
+            has_field = ({"src": f["classFqn"], "dst": f["fqn"]} for f in fields)
+            self._batch_edges(progress, "HAS_FIELD", has_field, "Class", "fqn", "Field", "fqn",
+                              total=len(fields))
 
             # EXTENDS
             extends = [{"src": e["childFqn"], "dst": e["parentFqn"]}
@@ -221,20 +231,22 @@ class GraphLoader:
             self._batch_edges(progress, "IMPLEMENTS", implements, "Class", "fqn", "Class", "fqn")
 
             # CALLS (Method → Method) — the big one
-            calls = [{"src": c["callerFqn"], "dst": c["calleeFqn"], "line": c.get("line", 0)}
-                     for c in data.get("callGraph", [])]
-            self._batch_edges_with_props(progress, "CALLS", calls, "Method", "fqn", "Method", "fqn", ["line"])
+            call_graph = data.get("callGraph", [])
+            calls = ({"src": c["callerFqn"], "dst": c["calleeFqn"], "line": c.get("line", 0)}
+                     for c in call_graph)
+            self._batch_edges_with_props(progress, "CALLS", calls, "Method", "fqn", "Method", "fqn", ["line"],
+                                         total=len(call_graph))
 
             # OVERRIDES (Method → Method)
-            overrides = [{"src": o["methodFqn"], "dst": o["overridesFqn"]}
-                         for o in data.get("methodOverrides", [])]
-            self._batch_edges(progress, "OVERRIDES", overrides, "Method", "fqn", "Method", "fqn")
+            method_overrides = data.get("methodOverrides", [])
+            overrides = ({"src": o["methodFqn"], "dst": o["overridesFqn"]} for o in method_overrides)
+            self._batch_edges(progress, "OVERRIDES", overrides, "Method", "fqn", "Method", "fqn",
+                              total=len(method_overrides))
 
             # ANNOTATED_WITH — group by source label in single pass
             ann_groups = {"Class": [], "Method": [], "Field": []}
             for a in data.get("annotations", []):
-                kind = a.get("targetKind", "CLASS")
-                label = "Class" if kind == "CLASS" else "Method" if kind == "METHOD" else "Field"
+                label = _ANNOTATION_TARGET_LABEL.get(a.get("targetKind", "CLASS"), "Field")
                 ann_groups[label].append({"src": a["targetFqn"], "dst": a["annotationFqn"]})
             for label, edges in ann_groups.items():
                 if edges:
@@ -280,14 +292,36 @@ class GraphLoader:
         print(f"\nImport complete in {elapsed:.1f}s")
         return stats
 
-    def _batch_nodes(self, progress, desc: str, items: list, label: str, pk: str, props: list[str]):
+    def _bisect_batch(self, query: str, batch: list[dict]) -> list[dict]:
+        """Write what succeeds of a failed UNWIND batch by halving it.
+
+        One bad row used to send all of its batch (up to 1000 rows) down the
+        per-row path, one round-trip each. Halving isolates it in
+        O(log n) batched round-trips. Returns the rows from pieces of at most
+        BISECT_MIN rows that still failed, for the caller's per-row fallback.
+        """
+        if len(batch) <= BISECT_MIN:
+            return batch
+        mid = len(batch) // 2
+        leftover: list[dict] = []
+        for half in (batch[:mid], batch[mid:]):
+            try:
+                self.db.execute(query, {"batch": half})
+            except Exception:
+                leftover.extend(self._bisect_batch(query, half))
+        return leftover
+
+    def _batch_nodes(self, progress, desc: str, items: list, label: str, pk: str, props: tuple[str, ...]):
         """Create nodes using UNWIND in batches."""
         if not items:
             return
 
-        all_props = [pk] + props
-        set_clause = ", ".join(f"n.{p} = item.{p}" for p in props)
-        query = f"UNWIND $batch AS item CREATE (n:{label} {{{pk}: item.{pk}}}) SET {set_clause}"
+        all_props = (pk, *props)
+        # Rows are sanitized to exactly `all_props` below, so each one is
+        # assigned as a whole map — the bulk-ingest path: no per-property
+        # `n.p = item.p` expression to evaluate for every row.
+        query = f"UNWIND $batch AS item CREATE (n:{label}) SET n = item"
+        single_q = f"CREATE (n:{label}) SET n = $item"
 
         task = progress.add_task(f"{desc}...", total=len(items))
         for i in range(0, len(items), NODE_BATCH):
@@ -307,24 +341,24 @@ class GraphLoader:
             try:
                 self.db.execute(query, {"batch": clean})
             except Exception as e:
-                logger.warning(f"Batch {label} failed, falling back to individual: {e}")
-                for item in clean:
+                logger.warning("Batch %s failed, falling back to individual: %s", label, e)
+                for item in self._bisect_batch(query, clean):
                     try:
-                        self.db.execute(
-                            f"CREATE (n:{label} {{{pk}: $pk_val}}) SET " +
-                            ", ".join(f"n.{p} = ${p}" for p in props),
-                            {"pk_val": item[pk], **{p: item[p] for p in props}}
-                        )
+                        self.db.execute(single_q, {"item": item})
                     except Exception:
                         pass
 
             progress.update(task, advance=len(batch))
 
-    def _batch_edges(self, progress, desc: str, edges: list,
+    def _batch_edges(self, progress, desc: str, edges: Iterable[dict],
                      src_label: str, src_key: str, dst_label: str, dst_key: str,
-                     rel_type: str | None = None):
-        """Create edges using UNWIND in batches."""
-        if not edges:
+                     rel_type: str | None = None, total: int | None = None):
+        """Create edges using UNWIND in batches.
+
+        `edges` may be a lazy iterable; pass `total` (its length) then.
+        """
+        total = len(edges) if total is None else total
+        if not total:
             return
 
         rt = rel_type or desc.split(" ")[0]  # Use desc as rel type if not specified
@@ -334,34 +368,39 @@ class GraphLoader:
             MATCH (b:{dst_label} {{{dst_key}: edge.dst}})
             CREATE (a)-[:{rt}]->(b)
         """
+        # Per-row fallback, built once rather than for every failed row.
+        single_q = f"""
+            MATCH (a:{src_label} {{{src_key}: $src}})
+            MATCH (b:{dst_label} {{{dst_key}: $dst}})
+            CREATE (a)-[:{rt}]->(b)
+        """
 
         failed_count = 0
-        task = progress.add_task(f"{desc}...", total=len(edges))
-        for i in range(0, len(edges), EDGE_BATCH):
-            batch = edges[i:i + EDGE_BATCH]
+        task = progress.add_task(f"{desc}...", total=total)
+        for batch in _chunks(edges, EDGE_BATCH):
             try:
                 self.db.execute(query, {"batch": batch})
             except Exception as e:
-                logger.warning(f"Batch {desc} failed, retrying individually: {e}")
-                for edge in batch:
+                logger.warning("Batch %s failed, retrying individually: %s", desc, e)
+                for edge in self._bisect_batch(query, batch):
                     try:
-                        single_q = f"""
-                            MATCH (a:{src_label} {{{src_key}: $src}})
-                            MATCH (b:{dst_label} {{{dst_key}: $dst}})
-                            CREATE (a)-[:{rt}]->(b)
-                        """
                         self.db.execute(single_q, {"src": edge["src"], "dst": edge["dst"]})
                     except Exception:
                         failed_count += 1
             progress.update(task, advance=len(batch))
         if failed_count > 0:
-            logger.warning(f"{desc}: {failed_count} edges failed (missing nodes)")
+            logger.warning("%s: %d edges failed (missing nodes)", desc, failed_count)
 
-    def _batch_edges_with_props(self, progress, desc: str, edges: list,
+    def _batch_edges_with_props(self, progress, desc: str, edges: Iterable[dict],
                                 src_label: str, src_key: str, dst_label: str, dst_key: str,
-                                prop_names: list[str], rel_type: str | None = None):
-        """Create edges with properties using UNWIND in batches."""
-        if not edges:
+                                prop_names: list[str], rel_type: str | None = None,
+                                total: int | None = None):
+        """Create edges with properties using UNWIND in batches.
+
+        `edges` may be a lazy iterable; pass `total` (its length) then.
+        """
+        total = len(edges) if total is None else total
+        if not total:
             return
 
         rt = rel_type or desc
@@ -372,27 +411,26 @@ class GraphLoader:
             MATCH (b:{dst_label} {{{dst_key}: edge.dst}})
             CREATE (a)-[:{rt} {{{prop_clause}}}]->(b)
         """
+        props_set = ", ".join(f"{p}: ${p}" for p in prop_names)
+        single_q = f"""
+            MATCH (a:{src_label} {{{src_key}: $src}})
+            MATCH (b:{dst_label} {{{dst_key}: $dst}})
+            CREATE (a)-[:{rt} {{{props_set}}}]->(b)
+        """
 
         failed_count = 0
-        task = progress.add_task(f"{desc}...", total=len(edges))
-        for i in range(0, len(edges), EDGE_BATCH):
-            batch = edges[i:i + EDGE_BATCH]
+        task = progress.add_task(f"{desc}...", total=total)
+        for batch in _chunks(edges, EDGE_BATCH):
             try:
                 self.db.execute(query, {"batch": batch})
             except Exception as e:
-                logger.warning(f"Batch {desc} failed, retrying individually: {e}")
-                for edge in batch:
+                logger.warning("Batch %s failed, retrying individually: %s", desc, e)
+                for edge in self._bisect_batch(query, batch):
                     try:
-                        props_set = ", ".join(f"{p}: ${p}" for p in prop_names)
-                        single_q = f"""
-                            MATCH (a:{src_label} {{{src_key}: $src}})
-                            MATCH (b:{dst_label} {{{dst_key}: $dst}})
-                            CREATE (a)-[:{rt} {{{props_set}}}]->(b)
-                        """
                         self.db.execute(single_q, {"src": edge["src"], "dst": edge["dst"],
                                                     **{p: edge.get(p, "") for p in prop_names}})
                     except Exception:
                         failed_count += 1
             progress.update(task, advance=len(batch))
         if failed_count > 0:
-            logger.warning(f"{desc}: {failed_count} edges failed (missing nodes)")
+            logger.warning("%s: %d edges failed (missing nodes)", desc, failed_count)
@@ -56,20 +56,19 @@ def compute_method_pagerank(db, graph_name: str | None = None) -> dict[str, floa
 
     t0 = time.time()
 
-    # All CALLS edges in the graph. One round trip.
-    rows = db.query(
-        "MATCH (c:Method)-[:CALLS]->(m:Method) RETURN c.fqn AS src, m.fqn AS dst"
-    )
-    if not rows:
-        logger.info("No CALLS edges — skipping PageRank")
-        return {}
-
+    # All CALLS edges in the graph. One round trip, folded straight into the
+    # DiGraph — no intermediate list of ~600K row dicts.
     G: Any = nx.DiGraph()
-    for r in rows:
+    for r in db.iter_rows(
+        "MATCH (c:Method)-[:CALLS]->(m:Method) RETURN c.fqn AS src, m.fqn AS dst"
+    ):
         src = r.get("src")
         dst = r.get("dst")
         if src and dst:
             G.add_edge(src, dst)
+    if not G.number_of_edges():
+        logger.info("No CALLS edges — skipping PageRank")
+        return {}
 
     # Entry points: REST endpoint handlers + @Scheduled + main(). These seed
     # the personalization vector so importance "flows down" from traffic.
@@ -118,10 +117,18 @@ def compute_method_pagerank(db, graph_name: str | None = None) -> dict[str, floa
 
 
 def write_pagerank(db, scores: dict[str, float], batch_size: int = 5000) -> int:
-    """Write pagerank scores back onto Method nodes via batched UNWIND."""
+    """Write pagerank scores back onto Method nodes via batched UNWIND.
+
+    `scores` is the complete set for this run, so scores left from an
+    earlier run are cleared first: on a delta re-run a method that lost all
+    its CALLS edges is no longer in `scores`, and its old value would
+    otherwise survive and feed `rollup_class_pagerank`.
+    """
     if not scores:
         return 0
 
+    db.query("MATCH (m:Method) WHERE m.pagerank IS NOT NULL SET m.pagerank = NULL")
+
     items = [{"fqn": fqn, "pr": float(pr)} for fqn, pr in scores.items()]
     written = 0
     for i in range(0, len(items), batch_size):
@@ -136,43 +143,28 @@ def write_pagerank(db, scores: dict[str, float], batch_size: int = 5000) -> int:
     return written
 
 
-def compute_class_pagerank(db, method_scores: dict[str, float]) -> dict[str, float]:
+def rollup_class_pagerank(db) -> tuple[int, str | None]:
     """Roll method scores up to owning Class — a class's PR = sum of its methods'.
 
-    This is cheap (one query + dict sum) and makes class-level ranking
-    ("core services") a direct `ORDER BY Class.pagerank` query.
-    """
-    if not method_scores:
-        return {}
+    Runs after `write_pagerank`, entirely server-side: one aggregation that
+    sums Method.pagerank per class and writes Class.pagerank, instead of
+    shipping every HAS_METHOD pair to Python and UNWINDing the sums back.
+    Methods without a score (outside the call graph) count as 0 —
+    `write_pagerank` clears stale scores, so only this run's are summed. Makes
+    class-level ranking ("core services") a direct `ORDER BY Class.pagerank`.
 
+    Returns (classes scored, top class FQN).
+    """
     rows = db.query(
-        "MATCH (c:Class)-[:HAS_METHOD]->(m:Method) RETURN c.fqn AS cls, m.fqn AS mfqn"
+        "MATCH (c:Class)-[:HAS_METHOD]->(m:Method) "
+        "WITH c, sum(coalesce(m.pagerank, 0.0)) AS pr "
+        "SET c.pagerank = pr "
+        "WITH c, pr ORDER BY pr DESC "
+        "RETURN count(c) AS n, head(collect(c.fqn)) AS top"
     )
-    class_scores: dict[str, float] = {}
-    for r in rows:
-        cls = r.get("cls")
-        mfqn = r.get("mfqn")
-        if not cls or not mfqn:
-            continue
-        class_scores[cls] = class_scores.get(cls, 0.0) + method_scores.get(mfqn, 0.0)
-    return class_scores
-
-
-def write_class_pagerank(db, scores: dict[str, float], batch_size: int = 2000) -> int:
-    if not scores:
-        return 0
-    items = [{"fqn": fqn, "pr": float(pr)} for fqn, pr in scores.items()]
-    written = 0
-    for i in range(0, len(items), batch_size):
-        chunk = items[i : i + batch_size]
-        db.query(
-            "UNWIND $items AS row "
-            "MATCH (c:Class {fqn: row.fqn}) "
-            "SET c.pagerank = row.pr",
-            {"items": chunk},
-        )
-        written += len(chunk)
-    return written
+    if not rows:
+        return 0, None
+    return rows[0].get("n") or 0, rows[0].get("top")
 
 
 def run(db, graph_name: str | None = None) -> dict:
@@ -183,13 +175,12 @@ def run(db, graph_name: str | None = None) -> dict:
         return {"pagerank": "skipped"}
 
     n_methods = write_pagerank(db, method_scores)
-    class_scores = compute_class_pagerank(db, method_scores)
-    n_classes = write_class_pagerank(db, class_scores)
+    n_classes, top_class = rollup_class_pagerank(db)
 
     return {
         "methods_scored": n_methods,
         "classes_scored": n_classes,
         "top_method": max(method_scores, key=method_scores.get) if method_scores else None,
-        "top_class": max(class_scores, key=class_scores.get) if class_scores else None,
+        "top_class": top_class,
         "total_ms": int((time.time() - t0) * 1000),
     }
@@ -12,6 +12,14 @@ NODE_SCHEMA = {
     "Endpoint": "CREATE INDEX FOR (n:Endpoint) ON (n.id)",
     "Module": "CREATE INDEX FOR (n:Module) ON (n.name)",
     "Annotation": "CREATE INDEX FOR (n:Annotation) ON (n.fqn)",
+    # Secondary lookups. Without these each one is a label scan:
+    # delta sync deletes a class's members by classFqn, INJECTS edges
+    # match beans by classFqn, and "core services" / L0 order by pagerank.
+    "Method_classFqn": "CREATE INDEX FOR (n:Method) ON (n.classFqn)",
+    "Field_classFqn": "CREATE INDEX FOR (n:Field) ON (n.classFqn)",
+    "SpringBean_classFqn": "CREATE INDEX FOR (n:SpringBean) ON (n.classFqn)",
+    "Method_pagerank": "CREATE INDEX FOR (n:Method) ON (n.pagerank)",
+    "Class_pagerank": "CREATE INDEX FOR (n:Class) ON (n.pagerank)",
 }
 
 # Full-text search indexes — FalkorDB CALL procedure syntax.
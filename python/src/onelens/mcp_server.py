@@ -18,9 +18,12 @@ subsequent request is ~200ms.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import re
 from contextlib import asynccontextmanager
+from itertools import islice
 from pathlib import Path
 from typing import Any, Literal
 
@@ -44,9 +47,10 @@ async def lifespan(server: FastMCP):
         t0 = time.time()
         logger.info("Warming embedder + reranker...")
         try:
-            from onelens.context.embedder import QwenEmbedder
+            from onelens.context.embedder import get_default_embedder
 
-            _STATE["embedder"] = QwenEmbedder()
+            # The shared instance ChromaBackend embeds queries with.
+            _STATE["embedder"] = get_default_embedder()
             _STATE["embedder"].encode(["warmup"])
         except Exception as e:
             logger.warning("Embedder warmup failed: %s", e)
@@ -73,6 +77,19 @@ _STATE: dict[str, Any] = {
 }
 
 
+# backend -> kwargs builder for create_backend(graph, db_path). Unknown
+# backends fall through to the file-backed (falkordblite-style) layout.
+def _file_backed_kwargs(graph: str, db_path: str) -> dict:
+    return {"db_path": str(Path(db_path).expanduser() / graph), "graph_name": graph}
+
+
+_BACKEND_KWARGS = {
+    "falkordblite": _file_backed_kwargs,
+    "falkordb": lambda graph, _db_path: {"host": "localhost", "port": 17532, "graph_name": graph},
+    "neo4j": lambda _graph, _db_path: {"uri": "bolt://localhost:7687"},
+}
+
+
 def _get_db(backend: str, graph: str, db_path: str):
     """Cache one GraphDB per (backend, graph, db_path) tuple."""
     key = (backend, graph, db_path)
@@ -82,30 +99,40 @@ def _get_db(backend: str, graph: str, db_path: str):
 
     from onelens.graph.db import create_backend
 
-    if backend == "falkordblite":
-        db = create_backend(
-            backend,
-            db_path=str(Path(db_path).expanduser() / graph),
-            graph_name=graph,
-        )
-    elif backend == "falkordb":
-        db = create_backend(
-            backend, host="localhost", port=17532, graph_name=graph
-        )
-    elif backend == "neo4j":
-        db = create_backend(backend, uri="bolt://localhost:7687")
-    else:
-        db = create_backend(
-            backend,
-            db_path=str(Path(db_path).expanduser() / graph),
-            graph_name=graph,
-        )
+    build_kwargs = _BACKEND_KWARGS.get(backend, _file_backed_kwargs)
+    db = create_backend(backend, **build_kwargs(graph, db_path))
     cache[key] = db
     return db
 
 
 # ── Import / graph lifecycle ─────────────────────────────────────────────────
 
+# The plugin serialises `version`, then `exportType`, as the first keys of both
+# full and delta documents, so the discriminator sits in the first few hundred
+# bytes of a file that can be hundreds of MB.
+_EXPORT_TYPE_RE = re.compile(rb'"exportType"\s*:\s*"([A-Za-z_]+)"')
+_EXPORT_HEAD_BYTES = 4096
+
+
+def _sniff_export_type(path: Path) -> str:
+    """Return the export's `exportType` ("full" / "delta") without parsing it.
+
+    Only the head of the file is scanned; the loaders parse the document
+    themselves, so a full json.load here just to read one key doubled the
+    parse cost of every import. Falls back to a full parse for exports whose
+    key order we don't recognise.
+    """
+    with open(path, "rb") as f:
+        head = f.read(_EXPORT_HEAD_BYTES)
+    match = _EXPORT_TYPE_RE.search(head)
+    if match:
+        return match.group(1).decode()
+
+    from onelens.importer.export_io import load_export
+
+    return load_export(path).get("exportType", "full")
+
+
 
 @mcp.tool
 def import_graph(
@@ -120,12 +147,8 @@ def import_graph(
 
     Set context=True to also index methods/classes into ChromaDB for semantic search.
     """
-    import json
-
     path = Path(export_path).expanduser()
-    with open(path) as f:
-        header = json.load(f)
-    export_type = header.get("exportType", "full")
+    export_type = _sniff_export_type(path)
 
     db = _get_db(backend, graph, db_path)
 
@@ -184,13 +207,7 @@ def stats(
     from onelens.graph.db import NODE_TYPES
 
     db = _get_db(backend, graph, db_path)
-    counts: dict[str, int] = {}
-    for nt in NODE_TYPES:
-        try:
-            result = db.query(f"MATCH (n:{nt}) RETURN count(n) AS cnt")
-            counts[nt] = int(result[0]["cnt"]) if result else 0
-        except Exception:
-            counts[nt] = 0
+    counts = db.node_counts(NODE_TYPES)
     return {"graph": graph, "nodes": counts, "total": sum(counts.values())}
 
 
@@ -207,11 +224,28 @@ def query(
 ) -> list[dict]:
     """Run a raw Cypher query. Returns up to `limit` rows."""
     db = _get_db(backend, graph, db_path)
-    result = db.query(cypher) or []
-    return [
-        {k: (v if isinstance(v, (str, int, float, bool, type(None))) else str(v)) for k, v in row.items()}
-        for row in result[:limit]
-    ]
+    # Stop at `limit` rather than slicing a full list: rows past it aren't
+    # zipped into dicts. The backend may still fetch the whole result set
+    # (FalkorDB parses it in one reply). islice rejects negatives, so clamp.
+    rows = islice(db.iter_rows(cypher), max(limit, 0))
+    return [{k: _jsonable(v) for k, v in row.items()} for row in rows]
+
+
+def _jsonable(value: Any) -> Any:
+    """Coerce a Cypher result value into something the tool schema can carry.
+
+    Lists and maps (`collect(...)`, `labels(n)`, map projections) stay native
+    so callers get real JSON arrays/objects instead of a Python repr string
+    with single quotes they'd have to re-parse. Only opaque driver objects
+    (nodes, edges, paths) fall back to `str()`.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    return str(value)
 
 
 # ── Search (FTS + semantic) ──────────────────────────────────────────────────
@@ -233,10 +267,10 @@ def search(
     Semantic requires the graph to have been imported with context=True (ChromaDB).
     """
     if semantic:
-        from onelens.context.config import OneLensContextConfig
+        from onelens.context.config import get_default_config
         from onelens.context.searcher import search_context
 
-        config = OneLensContextConfig()
+        config = get_default_config()
         out = search_context(
             term,
             config.context_path(graph),
@@ -249,7 +283,7 @@ def search(
     from onelens.graph.analysis import search_code
 
     db = _get_db(backend, graph, db_path)
-    return search_code(db, term, node_type)[:n_results]
+    return search_code(db, term, node_type, limit=n_results)[:n_results]
 
 
 # ── Flow trace ───────────────────────────────────────────────────────────────
@@ -326,7 +360,7 @@ def impact(
 
 
 @mcp.tool
-def retrieve(
+async def retrieve(
     query: str,
     graph: str = "onelens",
     n_results: int = 10,
@@ -345,15 +379,38 @@ def retrieve(
     Requires both FalkorDB (structural) and --context (ChromaDB) indexed.
     project_root can be set via ONELENS_PROJECT_ROOT env if not passed.
     """
+    # Embedding, reranking and snippet reads are blocking CPU/GPU/disk work
+    # (~0.2-2s). Run them on a worker thread so the daemon's event loop keeps
+    # serving other requests (status pings, structural tools) meanwhile.
+    return await asyncio.to_thread(
+        _retrieve_sync,
+        query, graph, n_results, fanout, include_snippets, include_neighbors,
+        rerank, rerank_pool, project_root, backend, db_path,
+    )
+
+
+def _retrieve_sync(
+    query: str,
+    graph: str,
+    n_results: int,
+    fanout: int,
+    include_snippets: bool,
+    include_neighbors: bool,
+    rerank: bool,
+    rerank_pool: int,
+    project_root: str,
+    backend: str,
+    db_path: str,
+) -> list[dict]:
     import os
 
-    from onelens.context.config import OneLensContextConfig
+    from onelens.context.config import get_default_config
     from onelens.context.retrieval import hybrid_retrieve
 
     if not project_root:
         project_root = os.environ.get("ONELENS_PROJECT_ROOT", "")
 
-    config = OneLensContextConfig()
+    config = get_default_config()
     db = _get_db(backend, graph, db_path)
 
     hits = hybrid_retrieve(
@@ -415,10 +472,10 @@ def context_search(
     entity_type: one of "method", "class", "endpoint", or "" for any.
     room: Java package name filter, or "" for none.
     """
-    from onelens.context.config import OneLensContextConfig
+    from onelens.context.config import get_default_config
     from onelens.context.searcher import search_context
 
-    config = OneLensContextConfig()
+    config = get_default_config()
     out = search_context(
         query,
         config.context_path(graph),
@@ -13,19 +13,27 @@ Performance (measured on RTX A2000 4GB, large Spring monorepo, 2026-04):
 - Idempotent: re-run resumes via existing-ID check (no re-embedding)
 """
 
-import json
+import concurrent.futures
+import hashlib
 import logging
+import re
+import sys
 import time
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-from onelens.context.config import OneLensContextConfig, HALL_CODE
+from onelens.context.config import OneLensContextConfig, HALL_CODE, get_default_config
 from onelens.context.palace import get_collection
+from onelens.importer.export_io import load_export
 
 logger = logging.getLogger(__name__)
 
 BATCH_SIZE = 500  # ChromaDB write batch (embedding is the bottleneck; batch stays small)
+# Minimum seconds between per-batch progress lines. Small GPU batches flush
+# several times a second; one flushed stdout line each adds noise, not signal.
+PROGRESS_INTERVAL_S = 2.0
 
 # Body/javadoc caps on the python side (second line of defense after plugin caps).
 # Qwen3 max_seq=512 tokens ≈ 2000 chars; leave headroom for the metadata line.
@@ -34,7 +42,14 @@ MAX_JAVADOC_CHARS = 500
 
 # Trivial method patterns — skip these (no semantic value, ~45% of codebase)
 _TRIVIAL_PREFIXES = ("get", "set", "is", "has", "can")
-_TRIVIAL_NAMES = {"toString", "hashCode", "equals", "clone", "finalize"}
+_TRIVIAL_NAMES = frozenset({"toString", "hashCode", "equals", "clone", "finalize"})
+
+# Importance signals from annotations, matched as substrings of the
+# annotation FQNs. One compiled alternation scans a drawer's annotations in
+# a single pass instead of one `any(... in a)` sweep per keyword.
+_METHOD_ANNOTATION_WEIGHTS = {"Transactional": 0.15, "Scheduled": 0.1, "Async": 0.05}
+_METHOD_ANNOTATION_RE = re.compile("|".join(_METHOD_ANNOTATION_WEIGHTS))
+_STEREOTYPE_RE = re.compile("Service|Controller|Repository")
 
 
 def _clean_javadoc(raw: str | None) -> str:
@@ -46,17 +61,86 @@ def _clean_javadoc(raw: str | None) -> str:
         text = text[3:]
     if text.endswith("*/"):
         text = text[:-2]
-    lines = []
-    for line in text.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("*"):
-            stripped = stripped[1:].strip()
-        if stripped:
-            lines.append(stripped)
-    cleaned = " ".join(lines)
+    stripped = (line.strip() for line in text.splitlines())
+    unstarred = (line[1:].strip() if line.startswith("*") else line for line in stripped)
+    # Stop pulling lines once the joined text reaches the cap: long class
+    # Javadocs (license headers, usage guides) run to many KB and everything
+    # past the first MAX_JAVADOC_CHARS was cleaned only to be sliced off.
+    kept = []
+    size = -1  # no separator before the first line
+    for line in unstarred:
+        if not line:
+            continue
+        kept.append(line)
+        size += len(line) + 1
+        if size >= MAX_JAVADOC_CHARS:
+            break
+    cleaned = " ".join(kept)
     return cleaned[:MAX_JAVADOC_CHARS]
 
 
+@lru_cache(maxsize=1 << 16)
+def _short_ref(fqn: str) -> str:
+    """`Class.method` for a callee/caller FQN, in one partition pass.
+
+    Equivalent to `f"{_short_class(fqn)}.{_short_name(fqn)}"` but without the
+    four split() calls (each allocating a list) that pairing did — this runs
+    for up to 18 neighbors of every one of ~40K mined methods.
+
+    Cached: neighbor FQNs are heavily repeated (every caller of
+    `Logger#info`, every user of a shared repository method), so most calls
+    during a mine are a dict hit instead of string work + a new str object.
+    """
+    owner, sep, rest = fqn.partition("#")
+    cls = owner.rpartition(".")[2]
+    if not sep:
+        return f"{cls}.{cls}"
+    return f"{cls}.{rest.partition('#')[0].partition('(')[0]}"
+
+
+def _dedupe(items: list[dict], key) -> list[dict]:
+    """Collapse items sharing a drawer key, keeping the last occurrence.
+
+    The export can repeat an entity (e.g. the same handler mapped twice, or
+    a class re-listed in a delta); each duplicate would be embedded for
+    nothing and ChromaDB rejects duplicate IDs inside a single upsert.
+    Order follows first appearance so batch composition stays stable.
+    """
+    by_key = {key(item): item for item in items}
+    return list(by_key.values()) if len(by_key) != len(items) else items
+
+
+# Metadata left out of `doc_hash`: the hash itself, and the per-job
+# timestamp, which differs on every run and would defeat the skip.
+_UNHASHED_META = frozenset({"doc_hash", "filed_at"})
+
+
+def _stamp_doc_hashes(documents: list[str], metadatas: list[dict]) -> None:
+    """Record a short digest of each drawer's text and metadata in its metadata.
+
+    Delta sync compares it against the stored drawer and skips the upsert
+    when both are unchanged (see `mine_upserts`). Metadata is hashed too so
+    a changed importance or pagerank with identical text is still written.
+    """
+    for doc, meta in zip(documents, metadatas):
+        h = hashlib.blake2b(doc.encode("utf-8"), digest_size=8)
+        h.update(repr(sorted(
+            (k, v) for k, v in meta.items() if k not in _UNHASHED_META
+        )).encode("utf-8"))
+        meta["doc_hash"] = h.hexdigest()
+
+
+def _endpoint_ids(ep: dict) -> tuple[str, str]:
+    """(`HTTP:path` fqn, drawer ID) for an endpoint, built once per endpoint.
+
+    The drawer ID carries the handler FQN so the same path mapped by two
+    controllers yields two drawers instead of a collision.
+    """
+    ep_fqn = f"{ep.get('httpMethod', '')}:{ep.get('path', '')}"
+    handler = ep.get("handlerMethodFqn", "")
+    return ep_fqn, (f"endpoint:{ep_fqn}:{handler}" if handler else f"endpoint:{ep_fqn}")
+
+
 def _is_trivial_method(method: dict) -> bool:
     """True if method is a getter/setter/toString/hashCode/equals.
 
@@ -84,15 +168,26 @@ class CodeMiner:
 
     def __init__(self, graph_name: str, config: OneLensContextConfig = None):
         self.graph_name = graph_name
-        self.config = config or OneLensContextConfig()
+        self.config = config or get_default_config()
         self.context_path = self.config.context_path(graph_name)
         self._collection = None
+        # Per-job state, reset by `_start_job`: one filed_at stamp shared by
+        # every drawer the job writes, and the lazily scanned set of drawer
+        # IDs already in the collection, plus the drawers queued for the next
+        # embed batch (shared across phases, see `_write_drawers`).
+        self._filed_at = datetime.now().isoformat()
+        self._existing_ids: set | None = None
+        self._batch: tuple[list, list, list] = ([], [], [])
+        # Background Chroma writer, only set for the duration of `mine()`.
+        self._writer = None
+        self._pending_write = None
 
         # Pre-computed indexes (populated by _build_indexes)
         self._call_out = defaultdict(list)    # callerFqn -> [calleeFqn, ...]
         self._call_in = defaultdict(list)     # calleeFqn -> [callerFqn, ...]
         self._method_to_class = {}            # methodFqn -> classFqn
         self._class_methods = defaultdict(list)  # classFqn -> [methodFqn, ...]
+        self._class_fan_in = defaultdict(int)    # classFqn -> sum of its methods' fan-in
         self._handler_to_endpoint = {}        # handlerFqn -> (httpMethod, path)
         self._endpoint_to_handler = {}        # "METHOD:path" -> handlerFqn
         self._method_annotations = defaultdict(list)  # fqn -> [annotationFqn, ...]
@@ -100,26 +195,37 @@ class CodeMiner:
         self._injections = defaultdict(list)  # targetClassFqn -> [injectedClassFqn, ...]
         self._class_info = {}                 # classFqn -> dict
 
+    def _start_job(self):
+        self._filed_at = datetime.now().isoformat()
+        self._existing_ids = None
+        self._batch = ([], [], [])
+
     def mine(self, export_path: Path) -> dict:
         """Mine the export JSON into ChromaDB. Returns stats dict."""
         t0 = time.time()
-
-        print(f"Loading JSON ({export_path.name})...", flush=True)
-        t1 = time.time()
-        with open(export_path) as f:
-            data = json.load(f)
-        print(f"  JSON loaded in {time.time() - t1:.1f}s — "
-              f"{len(data.get('methods', []))} methods, "
-              f"{len(data.get('classes', []))} classes, "
-              f"{len(data.get('callGraph', []))} call edges", flush=True)
-
-        print("Building indexes...", flush=True)
-        t2 = time.time()
-        self._build_indexes(data)
-        print(f"  Indexes built in {time.time() - t2:.1f}s", flush=True)
-
-        print("Connecting to ChromaDB...", flush=True)
-        self._collection = get_collection(self.context_path, create=True)
+        self._start_job()
+
+        # Opening the collection loads the embedder (tens of seconds, mostly
+        # weight I/O and CUDA init) and is independent of the export, so run
+        # it alongside JSON parsing + index building instead of after them.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            print("Connecting to ChromaDB (background)...", flush=True)
+            collection_future = pool.submit(get_collection, self.context_path, create=True)
+
+            print(f"Loading JSON ({export_path.name})...", flush=True)
+            t1 = time.time()
+            data = load_export(export_path)
+            print(f"  JSON loaded in {time.time() - t1:.1f}s — "
+                  f"{len(data.get('methods', []))} methods, "
+                  f"{len(data.get('classes', []))} classes, "
+                  f"{len(data.get('callGraph', []))} call edges", flush=True)
+
+            print("Building indexes...", flush=True)
+            t2 = time.time()
+            self._build_indexes(data)
+            print(f"  Indexes built in {time.time() - t2:.1f}s", flush=True)
+
+            self._collection = collection_future.result()
 
         from onelens.context.palace import get_max_batch_size, get_embedding_device
         max_bs = get_max_batch_size()
@@ -128,9 +234,16 @@ class CodeMiner:
         print(f"  ChromaDB ready. Embedding: {device}, max batch: {max_bs}, using: {self._actual_batch}", flush=True)
 
         stats = {"methods": 0, "classes": 0, "endpoints": 0}
-        stats["methods"] = self._mine_methods(data)
-        stats["classes"] = self._mine_classes(data)
-        stats["endpoints"] = self._mine_endpoints(data)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as writer:
+            self._writer = writer
+            try:
+                stats["methods"] = self._mine_methods(data)
+                stats["classes"] = self._mine_classes(data)
+                stats["endpoints"] = self._mine_endpoints(data)
+                self._flush_batch(*self._batch)
+            finally:
+                self._writer = None
+                self._drain_writes()
 
         total_time = time.time() - t0
         total_drawers = sum(stats.values())
@@ -143,19 +256,29 @@ class CodeMiner:
 
     def _build_indexes(self, data: dict):
         """Pre-compute lookup structures for O(1) access during mining."""
-        # Call graph
+        # Call graph. FQNs are interned: the JSON parser yields a fresh string
+        # for every occurrence, and a method with N callers would otherwise
+        # pin N copies of each caller/callee FQN in these lists for the whole
+        # mine. Interned, each FQN is stored once and dict lookups on it can
+        # short-circuit on identity.
+        intern = sys.intern
         for edge in data.get("callGraph", []):
-            caller = edge["callerFqn"]
-            callee = edge["calleeFqn"]
+            caller = intern(edge["callerFqn"])
+            callee = intern(edge["calleeFqn"])
             self._call_out[caller].append(callee)
             self._call_in[callee].append(caller)
 
-        # Method → class mapping
+        # Method → class mapping. Class fan-in is rolled up here, in the same
+        # pass, so class importance is a lookup instead of a re-walk of the
+        # class's methods.
         for method in data.get("methods", []):
-            fqn = method["fqn"]
+            fqn = intern(method["fqn"])
             cls_fqn = method.get("classFqn", "")
+            if cls_fqn:
+                cls_fqn = intern(cls_fqn)
             self._method_to_class[fqn] = cls_fqn
             self._class_methods[cls_fqn].append(fqn)
+            self._class_fan_in[cls_fqn] += len(self._call_in.get(fqn, ()))
 
         # Endpoints
         spring = data.get("spring", {})
@@ -199,23 +322,19 @@ class CodeMiner:
             score += min(fan_in / 20.0, 0.4)
             if fqn in self._handler_to_endpoint:
                 score += 0.3
-            anns = self._method_annotations.get(fqn, [])
-            if any("Transactional" in a for a in anns):
-                score += 0.15
-            if any("Scheduled" in a for a in anns):
-                score += 0.1
-            if any("Async" in a for a in anns):
-                score += 0.05
+            anns = self._method_annotations.get(fqn)
+            if anns:
+                found = set(_METHOD_ANNOTATION_RE.findall("\n".join(anns)))
+                score += sum(_METHOD_ANNOTATION_WEIGHTS[k] for k in found)
 
         elif entity_type == "class":
-            methods = self._class_methods.get(fqn, [])
-            total_fan_in = sum(len(self._call_in.get(m, [])) for m in methods)
+            total_fan_in = self._class_fan_in.get(fqn, 0)
             score += min(total_fan_in / 50.0, 0.4)
-            score += min(len(methods) / 30.0, 0.2)
+            score += min(len(self._class_methods.get(fqn, ())) / 30.0, 0.2)
             injectors = len(self._injections.get(fqn, []))
             score += min(injectors / 10.0, 0.2)
-            anns = self._class_annotations.get(fqn, [])
-            if any("Service" in a or "Controller" in a or "Repository" in a for a in anns):
+            anns = self._class_annotations.get(fqn)
+            if anns and _STEREOTYPE_RE.search("\n".join(anns)):
                 score += 0.1
 
         elif entity_type == "endpoint":
@@ -279,44 +398,32 @@ class CodeMiner:
 
         # Callees (what this method calls)
         callees = self._call_out.get(fqn, [])
-        callee_names = sorted(set(
-            f"{self._short_class(c)}.{self._short_name(c)}"
-            for c in callees[:10]
-        ))
+        callee_names = sorted({_short_ref(c) for c in callees[:10]})
 
         # Callers (who calls this method)
         callers = self._call_in.get(fqn, [])
-        caller_names = sorted(set(
-            f"{self._short_class(c)}.{self._short_name(c)}"
-            for c in callers[:8]
-        ))
+        caller_names = sorted({_short_ref(c) for c in callers[:8]})
 
         # Endpoint
         endpoint = self._handler_to_endpoint.get(fqn)
 
-        parts = [f"{class_name}#{method_name}{params}"]
-        if ann_str:
-            parts.append(f"| {ann_str}")
-        if callee_names:
-            parts.append(f"| calls: {', '.join(callee_names[:8])}")
-        if caller_names:
-            parts.append(f"| calledBy: {', '.join(caller_names[:5])}")
-        if endpoint:
-            parts.append(f"| endpoint: {endpoint[0]} {endpoint[1]}")
-
-        header = " ".join(parts)
+        # Built as one concatenation: each optional piece is either its text
+        # or "", so no per-drawer parts/sections lists to grow and re-join.
+        header = (
+            f"{class_name}#{method_name}{params}"
+            + (f" | {ann_str}" if ann_str else "")
+            + (f" | calls: {', '.join(callee_names[:8])}" if callee_names else "")
+            + (f" | calledBy: {', '.join(caller_names[:5])}" if caller_names else "")
+            + (f" | endpoint: {endpoint[0]} {endpoint[1]}" if endpoint else "")
+        )
 
         javadoc = _clean_javadoc(method.get("javadoc"))
         body = method.get("body")
-        if body:
-            body = body[:MAX_BODY_CHARS]
-
-        sections = [header]
-        if javadoc:
-            sections.append(javadoc)
-        if body:
-            sections.append(body)
-        return "\n---\n".join(sections)
+        return (
+            header
+            + (f"\n---\n{javadoc}" if javadoc else "")
+            + (f"\n---\n{body[:MAX_BODY_CHARS]}" if body else "")
+        )
 
     def _format_class_document(self, cls: dict) -> str:
         """Build embedding text for a class drawer."""
@@ -361,10 +468,7 @@ class CodeMiner:
 
         # What the handler calls
         callees = self._call_out.get(handler_fqn, [])
-        callee_names = sorted(set(
-            f"{self._short_class(c)}.{self._short_name(c)}"
-            for c in callees[:8]
-        ))
+        callee_names = sorted({_short_ref(c) for c in callees[:8]})
 
         parts = [f"{http} {path}"]
         if handler_short:
@@ -390,6 +494,7 @@ class CodeMiner:
         skipped (mirrors the resume-on-crash behavior of mine()).
         """
         skip = skip_existing or set()
+        self._start_job()
         self._build_indexes(data)
 
         # Methods
@@ -398,92 +503,84 @@ class CodeMiner:
                 continue
             if _is_trivial_method(m):
                 continue
-            fqn = m["fqn"]
-            drawer_id = f"method:{fqn}"
+            drawer_id = f"method:{m['fqn']}"
             if drawer_id in skip:
                 continue
-            cls_fqn = m.get("classFqn", "")
-            pkg = cls_fqn.rsplit(".", 1)[0] if "." in cls_fqn else ""
             yield {
                 "id": drawer_id,
                 "document": self._format_method_document(m),
-                "metadata": {
-                    "wing": self.graph_name,
-                    "room": pkg,
-                    "hall": HALL_CODE,
-                    "fqn": fqn,
-                    "type": "method",
-                    "importance": self._compute_importance(fqn, "method"),
-                    "filed_at": datetime.now().isoformat(),
-                },
+                "metadata": self._method_metadata(m),
             }
 
         # Classes
         for cls in data.get("classes", []):
             if not cls.get("filePath"):
                 continue
-            fqn = cls["fqn"]
-            drawer_id = f"class:{fqn}"
+            drawer_id = f"class:{cls['fqn']}"
             if drawer_id in skip:
                 continue
             yield {
                 "id": drawer_id,
                 "document": self._format_class_document(cls),
-                "metadata": {
-                    "wing": self.graph_name,
-                    "room": cls.get("packageName", ""),
-                    "hall": HALL_CODE,
-                    "fqn": fqn,
-                    "type": "class",
-                    "importance": self._compute_importance(fqn, "class"),
-                    "filed_at": datetime.now().isoformat(),
-                },
+                "metadata": self._class_metadata(cls),
             }
 
         # Endpoints
         for ep in data.get("spring", {}).get("endpoints", []):
-            http = ep.get("httpMethod", "")
-            path = ep.get("path", "")
-            handler = ep.get("handlerMethodFqn", "")
-            drawer_id = f"endpoint:{http}:{path}:{handler}" if handler else f"endpoint:{http}:{path}"
+            ep_fqn, drawer_id = _endpoint_ids(ep)
             if drawer_id in skip:
                 continue
-            controller = ep.get("controllerFqn", "")
-            pkg = controller.rsplit(".", 1)[0] if "." in controller else ""
-            ep_fqn = f"{http}:{path}"
             yield {
                 "id": drawer_id,
                 "document": self._format_endpoint_document(ep),
-                "metadata": {
-                    "wing": self.graph_name,
-                    "room": pkg,
-                    "hall": HALL_CODE,
-                    "fqn": ep_fqn,
-                    "type": "endpoint",
-                    "importance": self._compute_importance(ep_fqn, "endpoint"),
-                    "filed_at": datetime.now().isoformat(),
-                },
+                "metadata": self._endpoint_metadata(ep, ep_fqn),
             }
 
     # ── Mining (batch upsert) ─────────────────────────────────────────────
 
     def _flush_batch(self, documents, ids, metadatas):
-        """Upsert a batch to ChromaDB."""
+        """Upsert a batch to ChromaDB.
+
+        Inside `mine()` the batch is embedded here and its Chroma write is
+        handed to a single writer thread, so the next batch's embedding
+        (GPU) overlaps this batch's write (SQLite + HNSW). At most one write
+        is in flight; waiting on it before queueing the next keeps memory
+        bounded and write order intact.
+        """
         if not documents:
             return
-        self._collection.upsert(documents=documents, ids=ids, metadatas=metadatas)
+        _stamp_doc_hashes(documents, metadatas)
+        if self._writer is None:
+            self._collection.upsert(documents=documents, ids=ids, metadatas=metadatas)
+            return
+        embeddings = self._collection.embed(documents)
+        self._drain_writes()
+        self._pending_write = self._writer.submit(
+            self._collection.upsert,
+            documents=documents, ids=ids, metadatas=metadatas, embeddings=embeddings,
+        )
+
+    def _drain_writes(self):
+        """Block until the in-flight Chroma write (if any) lands; re-raise its error."""
+        pending, self._pending_write = self._pending_write, None
+        if pending is not None:
+            pending.result()
 
     def _get_existing_ids(self, prefix: str) -> set:
         """Return set of IDs already in ChromaDB with the given prefix.
 
         Used to resume a crashed import without re-embedding everything.
+        The collection is scanned once per job and shared by every phase —
+        each phase only writes its own prefix, so the snapshot stays valid
+        for the phases after it.
         """
-        try:
-            result = self._collection.get(include=[])  # IDs only
-            all_ids = result.get("ids", [])
-            return {i for i in all_ids if i.startswith(prefix)}
-        except Exception:
-            return set()
+        if self._existing_ids is None:
+            try:
+                result = self._collection.get(include=[])  # IDs only
+                self._existing_ids = set(result.get("ids", []))
+            except Exception:
+                return set()
+        return {i for i in self._existing_ids if i.startswith(prefix)}
 
     # ── Delta support ────────────────────────────────────────────────────────
 
@@ -556,14 +653,23 @@ class CodeMiner:
         Skipped for external methods (no filePath) and constructors, matching
         the policy in `_mine_methods`.
         """
-        self._ensure_collection()
-
         methods = [
             m for m in delta_data.get("methods", [])
             if m.get("filePath") and not m.get("isConstructor")
         ]
-        methods = [m for m in methods if not _is_trivial_method(m)]
-        classes = [c for c in delta_data.get("classes", []) if c.get("filePath")]
+        methods = _dedupe([m for m in methods if not _is_trivial_method(m)], lambda m: m.get("fqn"))
+        classes = _dedupe(
+            [c for c in delta_data.get("classes", []) if c.get("filePath")], lambda c: c.get("fqn")
+        )
+
+        # Deletion-only / trivial-only deltas are the common auto-sync case.
+        # Bail before `_ensure_collection` — opening the collection loads the
+        # embedder (~30s cold) for a delta that has nothing to embed.
+        if not methods and not classes:
+            return {"methods_upserted": 0, "classes_upserted": 0, "unchanged_skipped": 0}
+
+        self._start_job()
+        self._ensure_collection()
 
         # Partial index build — just enough for call_out / call_in so the
         # formatter's "calls: X, Y / calledBy: W, Z" context renders.
@@ -585,16 +691,39 @@ class CodeMiner:
         try:
             m_count = 0
             c_count = 0
-            batch_size = 64
+            unchanged = 0
+            # Same write batch as the full mine: every upsert is its own
+            # Chroma transaction, so 64-doc batches paid ~8x the commits.
+            batch_size = BATCH_SIZE
             docs: list[str] = []
             ids: list[str] = []
             metas: list[dict] = []
 
             def flush():
-                nonlocal docs, ids, metas
-                if docs:
-                    self._collection.upsert(documents=docs, ids=ids, metadatas=metas)
-                    docs, ids, metas = [], [], []
+                # Auto-sync re-sends every method of a touched file, but an
+                # edit usually changes one. Drawers whose text and metadata
+                # hash the same as the stored copy keep their embedding.
+                nonlocal docs, ids, metas, m_count, c_count, unchanged
+                if not docs:
+                    return
+                _stamp_doc_hashes(docs, metas)
+                stored = self._stored_doc_hashes(ids)
+                keep = [
+                    i for i, (drawer_id, meta) in enumerate(zip(ids, metas))
+                    if stored.get(drawer_id) != meta["doc_hash"]
+                ]
+                unchanged += len(ids) - len(keep)
+                if keep:
+                    kept_ids = [ids[i] for i in keep]
+                    self._collection.upsert(
+                        documents=[docs[i] for i in keep],
+                        ids=kept_ids,
+                        metadatas=[metas[i] for i in keep],
+                    )
+                    n_methods = sum(1 for i in kept_ids if i.startswith("method:"))
+                    m_count += n_methods
+                    c_count += len(kept_ids) - n_methods
+                docs, ids, metas = [], [], []
 
             for m in methods:
                 fqn = m.get("fqn")
@@ -603,11 +732,10 @@ class CodeMiner:
                 docs.append(self._format_method_document(m))
                 ids.append(f"method:{fqn}")
                 metas.append(self._method_metadata(m))
-                m_count += 1
                 if len(docs) >= batch_size:
                     flush()
-            flush()
 
+            # Classes share the open batch with any method tail.
             for c in classes:
                 fqn = c.get("fqn")
                 if not fqn:
@@ -615,18 +743,36 @@ class CodeMiner:
                 docs.append(self._format_class_document(c))
                 ids.append(f"class:{fqn}")
                 metas.append(self._class_metadata(c))
-                c_count += 1
                 if len(docs) >= batch_size:
                     flush()
             flush()
 
-            return {"methods_upserted": m_count, "classes_upserted": c_count}
+            return {
+                "methods_upserted": m_count,
+                "classes_upserted": c_count,
+                "unchanged_skipped": unchanged,
+            }
         finally:
             self._call_out, self._call_in = prev_out, prev_in
 
+    def _stored_doc_hashes(self, ids: list[str]) -> dict[str, str]:
+        """{drawer_id: doc_hash} for the given IDs already in the collection.
+
+        Drawers written before doc_hash existed (or by `iter_drawers`
+        callers) have none and are always re-embedded.
+        """
+        try:
+            result = self._collection.get(ids=ids, include=["metadatas"])
+        except Exception:
+            return {}
+        return {
+            drawer_id: (meta or {}).get("doc_hash")
+            for drawer_id, meta in zip(result.get("ids", []), result.get("metadatas", []))
+        }
+
     def _method_metadata(self, m: dict) -> dict:
-        """Canonical drawer metadata for a method, matching `_mine_methods`
-        (code_miner.py:677-685) exactly so semantic search filters that use
+        """Canonical drawer metadata for a method, shared by `_mine_methods`
+        and `mine_upserts` so semantic search filters that use
         `wing = graph_name` still hit drawers written via delta upsert.
         Adding new keys would be fine; dropping any breaks wing-scoped search.
         """
@@ -640,12 +786,12 @@ class CodeMiner:
             "fqn": fqn,
             "type": "method",
             "importance": self._compute_importance(fqn, "method"),
-            "filed_at": datetime.now().isoformat(),
+            "filed_at": self._filed_at,
         }
 
     def _class_metadata(self, c: dict) -> dict:
-        """Canonical drawer metadata for a class, matching `_mine_classes`
-        (code_miner.py:718-733). See `_method_metadata` for the rationale.
+        """Canonical drawer metadata for a class, shared by `_mine_classes`
+        and `mine_upserts`. See `_method_metadata` for the rationale.
         """
         fqn = c.get("fqn", "")
         return {
@@ -655,9 +801,66 @@ class CodeMiner:
             "fqn": fqn,
             "type": "class",
             "importance": self._compute_importance(fqn, "class"),
-            "filed_at": datetime.now().isoformat(),
+            "filed_at": self._filed_at,
+        }
+
+    def _endpoint_metadata(self, ep: dict, ep_fqn: str) -> dict:
+        """Canonical drawer metadata for an endpoint (`ep_fqn` = `HTTP:path`)."""
+        controller = ep.get("controllerFqn", "")
+        return {
+            "wing": self.graph_name,
+            "room": controller.rsplit(".", 1)[0] if "." in controller else "",
+            "hall": HALL_CODE,
+            "fqn": ep_fqn,
+            "type": "endpoint",
+            "importance": self._compute_importance(ep_fqn, "endpoint"),
+            "filed_at": self._filed_at,
         }
 
+    def _write_drawers(self, label: str, drawers, total: int) -> int:
+        """Batch (id, document, metadata) drawers into the collection.
+
+        Shared by every `_mine_*` phase so batching, background writes and
+        progress reporting live in one place. Returns the number queued.
+
+        The batch buffer outlives the phase: a phase's partial tail rides
+        along with the next phase's first drawers instead of going out as a
+        short encode call of its own, and the writer keeps overlapping
+        across phase boundaries. `mine()` flushes whatever is left at the
+        end.
+        """
+        batch_size = getattr(self, "_actual_batch", BATCH_SIZE)
+        documents, ids, metadatas = self._batch
+        done = 0
+        t_start = last_report = time.time()
+
+        for drawer_id, doc, meta in drawers:
+            documents.append(doc)
+            ids.append(drawer_id)
+            metadatas.append(meta)
+            done += 1
+
+            if len(documents) >= batch_size:
+                t_batch = time.time()
+                self._flush_batch(documents, ids, metadatas)
+                now = time.time()
+                if now - last_report >= PROGRESS_INTERVAL_S:
+                    last_report = now
+                    rate = done / max(now - t_start, 0.1)
+                    print(
+                        f"  {label}: {done}/{total} ({rate:.0f}/s, batch={now - t_batch:.1f}s)",
+                        flush=True,
+                    )
+                documents, ids, metadatas = self._batch = ([], [], [])
+
+        elapsed = time.time() - t_start
+        print(
+            f"  {label.capitalize()} done: {done} in {elapsed:.1f}s "
+            f"({done / max(elapsed, 0.1):.0f}/s)",
+            flush=True,
+        )
+        return done
+
     def _mine_methods(self, data: dict) -> int:
         """Mine all project methods into ChromaDB. Returns count."""
         all_methods = [
@@ -666,163 +869,61 @@ class CodeMiner:
         ]
         methods = [m for m in all_methods if not _is_trivial_method(m)]
         skipped_trivial = len(all_methods) - len(methods)
+        methods = _dedupe(methods, lambda m: m["fqn"])
 
-        # Skip methods already embedded (resume after crash/OOM)
-        existing = self._get_existing_ids("method:")
+        # Skip methods already embedded (resume after crash/OOM). Nothing to
+        # resume when there are no candidates — skip the full ID scan.
+        existing = self._get_existing_ids("method:") if methods else set()
         if existing:
             methods = [m for m in methods if f"method:{m['fqn']}" not in existing]
 
-        batch_size = getattr(self, "_actual_batch", BATCH_SIZE)
         print(
             f"Mining {len(methods)} methods "
             f"(skipped {skipped_trivial} trivial, {len(existing)} already indexed, "
-            f"batch={batch_size})...",
+            f"batch={getattr(self, '_actual_batch', BATCH_SIZE)})...",
             flush=True,
         )
-
-        documents, ids, metadatas = [], [], []
-        done = 0
-        t_start = time.time()
-
-        for method in methods:
-            fqn = method["fqn"]
-            doc = self._format_method_document(method)
-            cls_fqn = method.get("classFqn", "")
-            pkg = cls_fqn.rsplit(".", 1)[0] if "." in cls_fqn else ""
-
-            documents.append(doc)
-            ids.append(f"method:{fqn}")
-            metadatas.append({
-                "wing": self.graph_name,
-                "room": pkg,
-                "hall": HALL_CODE,
-                "fqn": fqn,
-                "type": "method",
-                "importance": self._compute_importance(fqn, "method"),
-                "filed_at": datetime.now().isoformat(),
-            })
-
-            if len(documents) >= batch_size:
-                t_batch = time.time()
-                self._flush_batch(documents, ids, metadatas)
-                done += len(documents)
-                elapsed = time.time() - t_start
-                batch_time = time.time() - t_batch
-                rate = done / max(elapsed, 0.1)
-                print(f"  methods: {done}/{len(methods)} ({rate:.0f}/s, batch={batch_time:.1f}s)", flush=True)
-                documents, ids, metadatas = [], [], []
-
-        if documents:
-            self._flush_batch(documents, ids, metadatas)
-            done += len(documents)
-
-        elapsed = time.time() - t_start
-        print(f"  Methods done: {done} in {elapsed:.1f}s ({done / max(elapsed, 0.1):.0f}/s)", flush=True)
-        return done
+        drawers = (
+            (f"method:{m['fqn']}", self._format_method_document(m), self._method_metadata(m))
+            for m in methods
+        )
+        return self._write_drawers("methods", drawers, len(methods))
 
     def _mine_classes(self, data: dict) -> int:
         """Mine all project classes into ChromaDB. Returns count."""
-        classes = [c for c in data.get("classes", []) if c.get("filePath")]
-        existing = self._get_existing_ids("class:")
+        classes = _dedupe([c for c in data.get("classes", []) if c.get("filePath")], lambda c: c["fqn"])
+        existing = self._get_existing_ids("class:") if classes else set()
         if existing:
             classes = [c for c in classes if f"class:{c['fqn']}" not in existing]
-        batch_size = getattr(self, "_actual_batch", BATCH_SIZE)
         print(f"Mining {len(classes)} classes ({len(existing)} already indexed)...", flush=True)
 
-        documents, ids, metadatas = [], [], []
-        done = 0
-        t_start = time.time()
-
-        for cls in classes:
-            fqn = cls["fqn"]
-            doc = self._format_class_document(cls)
-            pkg = cls.get("packageName", "")
-
-            documents.append(doc)
-            ids.append(f"class:{fqn}")
-            metadatas.append({
-                "wing": self.graph_name,
-                "room": pkg,
-                "hall": HALL_CODE,
-                "fqn": fqn,
-                "type": "class",
-                "importance": self._compute_importance(fqn, "class"),
-                "filed_at": datetime.now().isoformat(),
-            })
-
-            if len(documents) >= batch_size:
-                t_batch = time.time()
-                self._flush_batch(documents, ids, metadatas)
-                done += len(documents)
-                elapsed = time.time() - t_start
-                batch_time = time.time() - t_batch
-                print(f"  classes: {done}/{len(classes)} (batch={batch_time:.1f}s)", flush=True)
-                documents, ids, metadatas = [], [], []
-
-        if documents:
-            self._flush_batch(documents, ids, metadatas)
-            done += len(documents)
-
-        elapsed = time.time() - t_start
-        print(f"  Classes done: {done} in {elapsed:.1f}s", flush=True)
-        return done
+        drawers = (
+            (f"class:{c['fqn']}", self._format_class_document(c), self._class_metadata(c))
+            for c in classes
+        )
+        return self._write_drawers("classes", drawers, len(classes))
 
     def _mine_endpoints(self, data: dict) -> int:
         """Mine all REST endpoints into ChromaDB. Returns count."""
         all_endpoints = data.get("spring", {}).get("endpoints", [])
-        existing = self._get_existing_ids("endpoint:")
-
-        def _ep_id(ep):
-            http = ep.get("httpMethod", "")
-            path = ep.get("path", "")
-            handler = ep.get("handlerMethodFqn", "")
-            return f"endpoint:{http}:{path}:{handler}" if handler else f"endpoint:{http}:{path}"
-
-        endpoints = [ep for ep in all_endpoints if _ep_id(ep) not in existing]
-        batch_size = getattr(self, "_actual_batch", BATCH_SIZE)
+        existing = self._get_existing_ids("endpoint:") if all_endpoints else set()
+
+        # drawer ID -> (fqn, endpoint). IDs are built once per endpoint and
+        # reused for the resume filter, dedupe (last wins, as `_dedupe`) and
+        # the drawer itself.
+        endpoints: dict[str, tuple[str, dict]] = {}
+        for ep in all_endpoints:
+            ep_fqn, drawer_id = _endpoint_ids(ep)
+            if drawer_id not in existing:
+                endpoints[drawer_id] = (ep_fqn, ep)
         print(
             f"Mining {len(endpoints)} endpoints "
             f"({len(existing)} already indexed)...",
             flush=True,
         )
 
-        documents, ids, metadatas = [], [], []
-        done = 0
-        t_start = time.time()
-
-        for ep in endpoints:
-            http = ep.get("httpMethod", "")
-            path = ep.get("path", "")
-            ep_id = f"{http}:{path}"
-            doc = self._format_endpoint_document(ep)
-
-            handler = ep.get("handlerMethodFqn", "")
-            controller = ep.get("controllerFqn", "")
-            pkg = controller.rsplit(".", 1)[0] if "." in controller else ""
-
-            # Use handler FQN in ID to avoid duplicates (same path, different controllers)
-            unique_id = f"endpoint:{ep_id}:{handler}" if handler else f"endpoint:{ep_id}"
-            documents.append(doc)
-            ids.append(unique_id)
-            metadatas.append({
-                "wing": self.graph_name,
-                "room": pkg,
-                "hall": HALL_CODE,
-                "fqn": ep_id,
-                "type": "endpoint",
-                "importance": self._compute_importance(ep_id, "endpoint"),
-                "filed_at": datetime.now().isoformat(),
-            })
-
-            if len(documents) >= batch_size:
-                self._flush_batch(documents, ids, metadatas)
-                done += len(documents)
-                documents, ids, metadatas = [], [], []
-
-        if documents:
-            self._flush_batch(documents, ids, metadatas)
-            done += len(documents)
-
-        elapsed = time.time() - t_start
-        print(f"  Endpoints done: {done} in {elapsed:.1f}s", flush=True)
-        return done
+        drawers = (
+            (drawer_id, self._format_endpoint_document(ep), self._endpoint_metadata(ep, ep_fqn))
+            for drawer_id, (ep_fqn, ep) in endpoints.items()
+        )
+        return self._write_drawers("endpoints", drawers, len(endpoints))
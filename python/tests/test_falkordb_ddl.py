@@ -0,0 +1,83 @@
+"""Index-DDL filtering in the FalkorDB backend.
+
+`execute_ddl` drops schema statements whose index `_existing_indexes` reports
+as present, so the two must agree on the key shape for every schema entry.
+A mismatch either re-sends existing indexes (slow) or, worse, skips one that
+is missing.
+"""
+
+import pytest
+
+from onelens.graph.backends.falkordb_backend import FalkorDBBackend, _ddl_target
+from onelens.importer.schema import FULLTEXT_SCHEMA, NODE_SCHEMA
+
+
+def _backend_with_indexes(rows: list[dict]) -> FalkorDBBackend:
+    """A backend whose `CALL db.indexes()` returns `rows`; no server needed."""
+    backend = FalkorDBBackend.__new__(FalkorDBBackend)
+    backend.iter_rows = lambda cypher, params=None: iter(rows)
+    return backend
+
+
+@pytest.mark.parametrize("ddl", list(NODE_SCHEMA.values()) + list(FULLTEXT_SCHEMA.values()))
+def test_every_schema_statement_is_recognized(ddl):
+    # An unrecognized statement is always sent; a schema edit that breaks the
+    # regexes should fail here rather than silently lose the skip.
+    assert _ddl_target(ddl) is not None
+
+
+def test_fulltext_target_covers_all_fields():
+    assert _ddl_target(FULLTEXT_SCHEMA["Method_name"]) == (
+        "Method", frozenset({"name", "javadoc", "body"}), "FULLTEXT",
+    )
+
+
+def test_range_target():
+    assert _ddl_target(NODE_SCHEMA["Method_classFqn"]) == ("Method", "classFqn", "RANGE")
+
+
+@pytest.mark.parametrize("ddl", [
+    "CALL db.idx.vector.createNodeIndex('Method', 'embedding', 1024, 'cosine')",
+    # Positional-field form: no {field: ...} maps to key on.
+    "CALL db.idx.fulltext.createNodeIndex('Method', 'name')",
+])
+def test_unrecognized_statement_is_never_skipped(ddl):
+    assert _ddl_target(ddl) is None
+
+
+def test_existing_indexes_from_types_map():
+    backend = _backend_with_indexes([
+        # RANGE and FULLTEXT on the same property, as FalkorDB reports it.
+        {"label": "Method", "types": {
+            "fqn": ["RANGE"], "name": ["RANGE", "FULLTEXT"],
+            "javadoc": ["FULLTEXT"], "body": ["FULLTEXT"],
+        }},
+        {"label": "Class", "types": {"fqn": ["RANGE"], "name": ["FULLTEXT"]}},
+    ])
+    existing = backend._existing_indexes()
+
+    assert _ddl_target(NODE_SCHEMA["Method"]) in existing
+    assert ("Method", "name", "RANGE") in existing
+    assert _ddl_target(FULLTEXT_SCHEMA["Method_name"]) in existing
+    assert _ddl_target(FULLTEXT_SCHEMA["Class_name"]) in existing
+    assert _ddl_target(NODE_SCHEMA["Method_classFqn"]) not in existing
+    assert _ddl_target(FULLTEXT_SCHEMA["Endpoint_path"]) not in existing
+
+
+def test_partial_fulltext_index_is_not_treated_as_existing():
+    # An older graph indexed only Method.name; the full DDL must still be sent.
+    backend = _backend_with_indexes([
+        {"label": "Method", "types": {"name": ["FULLTEXT"]}},
+    ])
+    assert _ddl_target(FULLTEXT_SCHEMA["Method_name"]) not in backend._existing_indexes()
+
+
+def test_existing_indexes_from_legacy_rows():
+    backend = _backend_with_indexes([
+        {"label": "Class", "type": "range", "properties": ["fqn"]},
+        {"label": "Endpoint", "type": "fulltext", "properties": ["path"]},
+    ])
+    existing = backend._existing_indexes()
+
+    assert _ddl_target(NODE_SCHEMA["Class"]) in existing
+    assert _ddl_target(FULLTEXT_SCHEMA["Endpoint_path"]) in existing